@@ -3,20 +3,29 @@ import os
 import time
 import random
 import requests
+from requests.adapters import HTTPAdapter
 
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.instrumentation.requests import RequestsInstrumentor
 
 OTEL_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317")
 SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "ai-test-client")
+# le client est la racine des traces : son echantillonnage s'applique a l'app (ParentBased).
+# Par defaut tout est exporte ; un ratio < 1.0 supprime aussi les traces en erreur ou lentes
+# avant que le tail sampling du collector ne les voie.
+TRACE_SAMPLE_RATIO = float(os.getenv("AI_TRACE_SAMPLE_RATIO", "1.0"))
 
 # --- OTEL setup ---
 resource = Resource(attributes={"service.name": SERVICE_NAME})
-provider = TracerProvider(resource=resource)
+provider = TracerProvider(
+    resource=resource,
+    sampler=ParentBased(TraceIdRatioBased(TRACE_SAMPLE_RATIO)),
+)
 exporter = OTLPSpanExporter(endpoint=OTEL_ENDPOINT, insecure=True)
 processor = BatchSpanProcessor(exporter)
 provider.add_span_processor(processor)
@@ -28,6 +37,11 @@ RequestsInstrumentor().instrument()
 
 URL = "http://localhost:8000/predict"
 
+# session partagee : keep-alive et reutilisation des connexions entre requetes
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def send_request(test_type: str, scenario: str):
   prompt_map = {
@@ -44,11 +58,11 @@ def send_request(test_type: str, scenario: str):
       span.set_attribute("ai.client_role", "osmc_demo")
 
       payload = {"prompt": prompt, "scenario": scenario}
-      start = time.time()
+      start_ns = time.monotonic_ns()
       try:
-          resp = requests.post(URL, json=payload, timeout=5)
-          elapsed = time.time() - start
-          span.set_attribute("ai.client_latency_ms", elapsed * 1000)
+          resp = SESSION.post(URL, json=payload, timeout=5)
+          elapsed_ns = time.monotonic_ns() - start_ns
+          span.set_attribute("ai.client_latency_ms", elapsed_ns / 1e6)
           span.set_attribute("http.status_code", resp.status_code)
 
           if resp.ok:
@@ -63,13 +77,17 @@ def send_request(test_type: str, scenario: str):
 
 
 def main(duration_sec: int = 180):
-  end = time.time() + duration_sec
+  end_ns = time.monotonic_ns() + duration_sec * 1_000_000_000
   test_types = ["nominal", "drift", "stress", "prompt_injection"]
   scenarios = ["A", "B", "C"]
 
-  while time.time() < end:
-      test_type = random.choice(test_types)
-      scenario = random.choice(scenarios)
+  # plan tire d'avance (au plus une requete par 0.5 s) : pas de RNG dans la boucle mesuree
+  rng = random.Random()
+  plan = [(rng.choice(test_types), rng.choice(scenarios)) for _ in range(duration_sec * 2 + 1)]
+
+  for test_type, scenario in plan:
+      if time.monotonic_ns() >= end_ns:
+          break
       send_request(test_type, scenario)
       time.sleep(0.5)
 
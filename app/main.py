@@ -15,37 +15,44 @@ Game-changer improvements:
 
 import os
 import time
+import asyncio
 import random
-import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 import re
 import uuid
 import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
-from collections import defaultdict
+import orjson
+import functools
+import itertools
+import grpc
+from typing import Optional, Dict, List, Any, Tuple, Iterable
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from prometheus_client import (
     Counter,
     Histogram,
     Gauge,
     Summary,
-    generate_latest,
-    CONTENT_TYPE_LATEST,
+    REGISTRY,
 )
+from prometheus_client.exposition import choose_encoder
 
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
 
@@ -63,6 +70,14 @@ class Config:
     RATE_LIMIT_REQUESTS = 100
     RATE_LIMIT_WINDOW_SECONDS = 60
 
+    # Conversation tracking: least recently active conversations are evicted first
+    MAX_CONVERSATIONS = 10_000
+    CONVERSATION_RECENT_TOPICS = 16
+    CONVERSATION_SWEEP_SECONDS = 60
+
+    # Feedback: oldest entries are evicted beyond this many
+    FEEDBACK_STORAGE_SIZE = 100_000
+
     # SLO thresholds
     SLO_LATENCY_THRESHOLD_MS = 1000
     SLO_QUALITY_THRESHOLD = 0.8
@@ -71,9 +86,60 @@ class Config:
     SECURITY_SCORE_THRESHOLD = 0.5
     PII_BLOCK_THRESHOLD = 3  # Block if more than N PII found
 
+    # Request validation: hard cap on the prompt field, rejected with a 422
+    # before any analyzer runs. Kept above the prompt_length guardrail
+    # (PROMPT_LENGTH_LIMIT) so merely long prompts still take the 403
+    # guardrail path, with its audit event and metrics.
+    MAX_PROMPT_CHARS = 16384
+
     # Drift detection
     DRIFT_ALERT_THRESHOLD = 0.7
 
+    # Analyzer results are pure functions of the prompt: memoize recent ones
+    ANALYSIS_CACHE_SIZE = 4096
+
+    # /metrics: scrapes within this window share one encoded payload
+    METRICS_CACHE_TTL_SECONDS = 1.0
+
+    # Audit trail: prompts are logged as length + digest; set LOG_PROMPT_PREVIEW=1
+    # to also include the first PROMPT_PREVIEW_CHARS characters
+    LOG_PROMPT_PREVIEW = os.environ.get("LOG_PROMPT_PREVIEW") == "1"
+    PROMPT_PREVIEW_CHARS = 128
+
+    # Audit trail: log 1 in LOG_SAMPLE_RATE routine ai_predict events; errors,
+    # risky/hallucinated responses and guardrail warnings are always logged
+    LOG_SAMPLE_RATE = max(1, int(os.environ.get("LOG_SAMPLE_RATE", "1")))
+
+    # Log records waiting for the listener thread; past this, records are dropped
+    LOG_QUEUE_SIZE = 10000
+
+    # Audit trail: events are queued and written in batches by a flusher thread
+    AUDIT_QUEUE_SIZE = 10000
+    AUDIT_BATCH_SIZE = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS = 0.03
+
+    # Tracing: head-sample ratio for root spans. The default exports every
+    # trace and leaves the keep/drop decision to the collector's tail sampler
+    # (config-scalable.yaml). A ratio below 1.0 drops traces in the SDK before
+    # any tail policy sees them, error and slow requests included.
+    TRACE_SAMPLE_RATIO = float(os.environ.get("AI_TRACE_SAMPLE_RATIO", "1.0"))
+    # OTEL_SDK_DISABLED=true: no provider, exporter or export thread at all
+    TRACING_ENABLED = os.environ.get("OTEL_SDK_DISABLED", "").strip().lower() != "true"
+
+    # Span export: flush often in small batches so the queue never fills
+    # and exporter stalls stay off the request path. The standard OTEL_BSP_*
+    # variables override these defaults.
+    SPAN_MAX_QUEUE_SIZE = int(os.environ.get("OTEL_BSP_MAX_QUEUE_SIZE", "10000"))
+    SPAN_MAX_EXPORT_BATCH_SIZE = int(os.environ.get("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))
+    SPAN_SCHEDULE_DELAY_MS = int(os.environ.get("OTEL_BSP_SCHEDULE_DELAY", "500"))
+    SPAN_EXPORT_TIMEOUT_MS = int(os.environ.get("OTEL_BSP_EXPORT_TIMEOUT", "2000"))
+
+
+# Private generator for the simulation draws: bound methods, no shared module state.
+# Hot paths scale _RNG.random() (C) themselves rather than calling uniform(),
+# which is a Python-level wrapper around the same draw.
+_RNG = random.Random()
+
 
 # =============================================================================
 # ENUMS
@@ -111,17 +177,39 @@ class GuardrailAction(str, Enum):
 logger = logging.getLogger("ai_app")
 logger.setLevel(logging.INFO)
 
+# Request handlers only enqueue records; a listener thread owns the real
+# (blocking) file and stdout handlers.
+log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
 if not logger.handlers:
+    log_handlers = []
     try:
-        file_handler = logging.FileHandler("/logs/app.log")
+        # Reopens the file if logrotate moves it away
+        file_handler = logging.handlers.WatchedFileHandler("/logs/app.log")
         file_handler.setFormatter(logging.Formatter("%(message)s"))
-        logger.addHandler(file_handler)
+        log_handlers.append(file_handler)
     except Exception:
         pass
 
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setFormatter(logging.Formatter("%(message)s"))
-    logger.addHandler(stdout_handler)
+    log_handlers.append(stdout_handler)
+
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    logger.addHandler(DroppingQueueHandler(log_queue))
 
 
 # =============================================================================
@@ -137,21 +225,37 @@ resource = Resource(
     }
 )
 
-trace_provider = TracerProvider(resource=resource)
-
-# Only configure OTLP exporter if endpoint is available (Docker environment)
-otel_endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "otel-collector:4317")
-try:
-    otlp_exporter = OTLPSpanExporter(
-        endpoint=otel_endpoint,
-        insecure=True,
+if Config.TRACING_ENABLED:
+    trace_provider = TracerProvider(
+        resource=resource,
+        sampler=ParentBased(TraceIdRatioBased(Config.TRACE_SAMPLE_RATIO)),
     )
-    trace_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
-    logging.info(f"OpenTelemetry configured with endpoint: {otel_endpoint}")
-except Exception as e:
-    logging.warning(f"OpenTelemetry exporter not available (standalone mode): {e}")
 
-trace.set_tracer_provider(trace_provider)
+    # Only configure OTLP exporter if endpoint is available (Docker environment)
+    otel_endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "otel-collector:4317")
+    try:
+        otlp_exporter = OTLPSpanExporter(
+            endpoint=otel_endpoint,
+            insecure=True,
+            compression=grpc.Compression.Gzip,
+            channel_options=(("grpc.keepalive_time_ms", 30000),),
+        )
+        trace_provider.add_span_processor(BatchSpanProcessor(
+            otlp_exporter,
+            max_queue_size=Config.SPAN_MAX_QUEUE_SIZE,
+            max_export_batch_size=Config.SPAN_MAX_EXPORT_BATCH_SIZE,
+            schedule_delay_millis=Config.SPAN_SCHEDULE_DELAY_MS,
+            export_timeout_millis=Config.SPAN_EXPORT_TIMEOUT_MS,
+        ))
+        logging.info(f"OpenTelemetry configured with endpoint: {otel_endpoint}")
+    except Exception as e:
+        logging.warning(f"OpenTelemetry exporter not available (standalone mode): {e}")
+
+    trace.set_tracer_provider(trace_provider)
+else:
+    # Spans become non-recording no-ops: is_recording() guards skip attribute work
+    trace.set_tracer_provider(trace.NoOpTracerProvider())
+
 tracer = trace.get_tracer(Config.SERVICE_NAME)
 
 
@@ -160,8 +264,9 @@ tracer = trace.get_tracer(Config.SERVICE_NAME)
 # =============================================================================
 
 # --- Traffic metrics ---
+# "scenario" labels are always one of SCENARIO_TAGS: unknown scenarios map to "other"
 ai_requests_total = Counter(
-    "ai_requests_total", "Total AI requests", ["scenario", "endpoint"]
+    "ai_requests_total", "Total AI requests (unknown scenarios counted as 'other')", ["scenario", "endpoint"]
 )
 ai_requests_error_total = Counter(
     "ai_requests_error_total", "Failed AI requests", ["scenario", "error_type"]
@@ -178,10 +283,13 @@ ai_latency_seconds = Histogram(
 )
 
 # --- Quality metrics ---
+# Coarse below the 0.8 quality SLO, finer above it where nominal traffic lives
+# (simulated quality tops out at 0.95) so the p50/p95 quantile panels keep
+# their resolution; the alert rules read the _sum/_count mean, not buckets
 ai_response_quality_score = Histogram(
     "ai_response_quality_score", "Quality score distribution",
     ["scenario"],
-    buckets=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    buckets=[0.2, 0.4, 0.6, 0.8, 0.9, 0.95]
 )
 ai_quality_score = Gauge("ai_quality_score", "Current quality score (0-1)")
 
@@ -250,10 +358,14 @@ ai_user_feedback_total = Counter(
 ai_user_satisfaction_score = Gauge(
     "ai_user_satisfaction_score", "Average user satisfaction (1-5)"
 )
+ai_feedback_evicted_total = Counter(
+    "ai_feedback_evicted_total", "Feedback entries evicted from in-memory storage"
+)
 
 # --- GAME CHANGER: Conversation metrics ---
-ai_conversation_turns_total = Counter(
-    "ai_conversation_turns_total", "Conversation turns", ["conversation_length"]
+ai_conversation_turns = Histogram(
+    "ai_conversation_turns", "Conversation turn number per recorded turn",
+    buckets=[1, 2, 5, 10, 25, 100]
 )
 ai_conversation_duration_seconds = Histogram(
     "ai_conversation_duration_seconds", "Conversation duration",
@@ -287,6 +399,146 @@ ai_slo_error_budget_burn_rate = Gauge("ai_slo_error_budget_burn_rate", "Error bu
 ai_audit_events_total = Counter(
     "ai_audit_events_total", "Audit events", ["event_type", "severity"]
 )
+ai_audit_events_dropped_total = Counter(
+    "ai_audit_events_dropped_total", "Audit events dropped (queue full or failed write)"
+)
+
+# --- Analyzer caches ---
+ai_analysis_cache_hit_ratio = Gauge(
+    "ai_analysis_cache_hit_ratio", "Prompt analysis cache hit ratio", ["analyzer"]
+)
+
+# --- Label whitelists: keep label value sets closed, map the rest to "other" ---
+ALLOWED_TECHNIQUES = frozenset({
+    "system_override", "data_extraction", "role_manipulation",
+    "encoding_tricks", "delimiter_injection", "jailbreak",
+})
+ALLOWED_FEEDBACK_CATEGORIES = frozenset({
+    "general", "accuracy", "relevance", "safety", "latency", "tone",
+})
+
+
+def bounded_label(value: Optional[str], allowed: frozenset) -> str:
+    """Return value if whitelisted, otherwise 'other'"""
+    return value if value in allowed else "other"
+
+
+def classify_error(exc: Exception) -> str:
+    """Map an exception to a bounded error_type label"""
+    if isinstance(exc, TimeoutError):
+        return "timeout"
+    if isinstance(exc, (ValueError, TypeError)):
+        return "validation"
+    return "internal"
+
+
+# --- Pre-bound label children: avoid metric.labels(...) lookups per request ---
+SCENARIO_TAGS = (
+    "baseline", "after-mitigation", "drift", "latency-spike",
+    "prompt-injection", "high-risk", "toxic", "other",
+)
+
+
+class LabelChildren(dict):
+    """Memoized metric.labels(...) children keyed by label value(s).
+
+    Keys are a single value for one label, a tuple for several. Values
+    for ``fixed`` labels are bound once at construction.
+    """
+
+    def __init__(self, metric, labelnames: tuple, prebind: tuple = (), **fixed):
+        super().__init__()
+        self.metric = metric
+        self.labelnames = labelnames
+        self.fixed = fixed
+        for key in prebind:
+            self[key]
+
+    def __missing__(self, key):
+        values = key if isinstance(key, tuple) else (key,)
+        child = self.metric.labels(**dict(zip(self.labelnames, values)), **self.fixed)
+        self[key] = child
+        return child
+
+
+PREDICT_ENDPOINT = "/predict"
+DEFAULT_MODEL = "demo-medium"
+
+requests_by_scenario = LabelChildren(ai_requests_total, ("scenario",), SCENARIO_TAGS, endpoint=PREDICT_ENDPOINT)
+errors_by_scenario = LabelChildren(ai_requests_error_total, ("scenario", "error_type"))
+latency_by_scenario = LabelChildren(ai_latency_seconds, ("scenario",), SCENARIO_TAGS)
+quality_by_scenario = LabelChildren(ai_response_quality_score, ("scenario",), SCENARIO_TAGS)
+trust_by_scenario = LabelChildren(ai_trust_index, ("scenario",), SCENARIO_TAGS)
+drift_score_by_dimension = LabelChildren(ai_input_drift_score, ("scenario", "dimension"))
+risky_by_scenario = LabelChildren(ai_risky_responses_total, ("scenario", "risk_level"))
+toxicity_by_category = LabelChildren(ai_toxicity_events_total, ("category",), severity="high")
+hallucination_by_severity = LabelChildren(
+    ai_hallucination_events_total, ("severity",), ("high", "medium"), detector="rule-engine"
+)
+pii_detected_by_type = LabelChildren(ai_pii_detected_total, ("pii_type",), action="detected")
+injection_attempts = LabelChildren(ai_prompt_injection_attempts_total, ("technique", "blocked"))
+guardrail_triggers = LabelChildren(ai_guardrail_triggers_total, ("guardrail", "action"))
+guardrail_blocked = LabelChildren(ai_guardrail_blocked_total, ("reason",))
+audit_events = LabelChildren(ai_audit_events_total, ("event_type", "severity"))
+feedback_by_rating = LabelChildren(ai_user_feedback_total, ("rating", "category"))
+
+inflight_predict = ai_inflight_requests.labels(endpoint=PREDICT_ENDPOINT)
+tokens_input_default = ai_tokens_input_total.labels(model=DEFAULT_MODEL)
+tokens_output_default = ai_tokens_output_total.labels(model=DEFAULT_MODEL)
+drift_alert_warning = ai_drift_alerts_total.labels(severity="warning")
+compliance_gdpr = ai_compliance_score.labels(category="gdpr")
+compliance_ai_act = ai_compliance_score.labels(category="ai_act")
+rate_limit_blocked = ai_rate_limit_events_total.labels(reason="quota_exceeded", action="blocked")
+
+
+# =============================================================================
+# PROMPT CONTEXT (shared by the analyzers)
+# =============================================================================
+
+WORD_RE = re.compile(r'\b\w+\b')
+# ASCII fast path for WORD_RE: every non-word ASCII char becomes a space
+ASCII_NON_WORD_TABLE = str.maketrans({
+    c: " " for c in map(chr, range(128)) if not (c.isalnum() or c == "_")
+})
+
+
+def tokenize(text: str) -> frozenset:
+    """Word set of text, same tokens as WORD_RE.findall"""
+    if text.isascii():
+        return frozenset(text.translate(ASCII_NON_WORD_TABLE).split())
+    return frozenset(WORD_RE.findall(text))
+
+
+def line_anchored(pattern: str) -> str:
+    """Rewrite "X.*Y.*Z" so each line is scanned once, with the same matches for search.
+
+    Compile the result with re.MULTILINE. The keywords occur in order on a line
+    iff the first X on it is followed by the first Y after that, and so on; the
+    plain form retries from every X and is quadratic on "X X X ...".
+    """
+    if ".*" not in pattern:
+        return pattern
+    *heads, tail = pattern.split(".*")
+    return "^" + "".join(f"(?>.*?{head})" for head in heads) + ".*" + tail
+
+
+@dataclass(frozen=True, slots=True)
+class PromptContext:
+    """Prompt views computed once per request and read by every analyzer"""
+    raw: str
+    lower: str
+    words: frozenset
+
+    @classmethod
+    @functools.lru_cache(maxsize=Config.ANALYSIS_CACHE_SIZE)
+    def build(cls, prompt: str) -> "PromptContext":
+        lower = prompt.lower()
+        return cls(prompt, lower, tokenize(lower))
+
+    @classmethod
+    def of(cls, prompt: "str | PromptContext") -> "PromptContext":
+        """Accept either a raw prompt or an already built context"""
+        return prompt if isinstance(prompt, cls) else cls.build(prompt)
 
 
 # =============================================================================
@@ -297,11 +549,14 @@ class PIIDetector:
     """Advanced PII detection for GDPR compliance"""
 
     PATTERNS = {
-        PIIType.EMAIL: r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        # Local part starts where its character run starts (and holds a word
+        # character); a \b start let every position inside a long "a.a.a..."
+        # run rescan the rest of it
+        PIIType.EMAIL: r'(?<![A-Za-z0-9._%+-])[.%+-]*[A-Za-z0-9_][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
         PIIType.PHONE: r'\b(?:\+33|0033|0)[1-9](?:[.\-\s]?\d{2}){4}\b',
         PIIType.CREDIT_CARD: r'\b(?:\d{4}[.\-\s]?){3}\d{4}\b',
         PIIType.SSN: r'\b[12][0-9]{2}[0-1][0-9][0-9]{2}[0-9]{3}[0-9]{3}[0-9]{2}\b',
-        PIIType.IBAN: r'\b[A-Z]{2}\d{2}[A-Z0-9]{4}\d{7}([A-Z0-9]?){0,16}\b',
+        PIIType.IBAN: r'\b[A-Z]{2}\d{2}[A-Z0-9]{4}\d{7}(?:[A-Z0-9]?){0,16}\b',
         PIIType.IP_ADDRESS: r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
         PIIType.DATE_OF_BIRTH: r'\b(?:0[1-9]|[12][0-9]|3[01])[\/\-](?:0[1-9]|1[0-2])[\/\-](?:19|20)\d{2}\b',
     }
@@ -311,24 +566,35 @@ class PIIDetector:
         "prénom", "firstname", "lastname", "nom de famille"
     ]
 
+    # Compiled once at class load. PII formats are ASCII, so \b, \d and case
+    # folding use the ASCII tables. Each type is scanned on its own: matches
+    # overlap across types (an IP inside a dotted phone number, digits in an
+    # email), and one alternation would report only the first of them.
+    _COMPILED = {t: re.compile(p, re.IGNORECASE | re.ASCII) for t, p in PATTERNS.items()}
+    _NAME_RE = re.compile("|".join(map(re.escape, NAME_KEYWORDS)))
+
     @classmethod
-    def detect(cls, text: str) -> Dict[PIIType, List[str]]:
+    def detect(cls, text: "str | PromptContext") -> Dict[PIIType, List[str]]:
         """Detect all PII in text"""
+        return {pii_type: list(matches) for pii_type, matches in cls._scan(PromptContext.of(text))}
+
+    @classmethod
+    @functools.lru_cache(maxsize=Config.ANALYSIS_CACHE_SIZE)
+    def _scan(cls, ctx: PromptContext) -> tuple:
+        """Memoized scan, immutable: ((pii_type, (match, ...)), ...)"""
         found = {}
-        text_lower = text.lower()
 
-        for pii_type, pattern in cls.PATTERNS.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pii_type, regex in cls._COMPILED.items():
+            matches = regex.findall(ctx.raw)
             if matches:
                 found[pii_type] = matches
 
-        # Name detection (heuristic)
-        for keyword in cls.NAME_KEYWORDS:
-            if keyword in text_lower:
-                found[PIIType.NAME] = [keyword]
-                break
+        # Name detection (heuristic); the alternation only gates, the reported
+        # keyword is the first one in NAME_KEYWORDS order present in the text
+        if cls._NAME_RE.search(ctx.lower):
+            found[PIIType.NAME] = [next(kw for kw in cls.NAME_KEYWORDS if kw in ctx.lower)]
 
-        return found
+        return tuple((pii_type, tuple(matches)) for pii_type, matches in found.items())
 
     @classmethod
     def redact(cls, text: str, found_pii: Dict[PIIType, List[str]]) -> str:
@@ -353,40 +619,40 @@ class PromptSecurityAnalyzer:
     """Advanced prompt security analysis"""
 
     INJECTION_PATTERNS = {
-        "system_override": [
+        "system_override": (
             r"ignore.*(?:previous|above|all).*(?:instructions|rules)",
             r"(?:forget|disregard).*(?:instructions|guidelines)",
             r"you are now",
             r"act as",
             r"pretend.*(?:you|to be)",
             r"new.*(?:role|persona|identity)",
-        ],
-        "data_extraction": [
+        ),
+        "data_extraction": (
             r"(?:reveal|show|display|print).*(?:prompt|instructions|system)",
             r"what.*(?:your|the).*(?:instructions|prompt|rules)",
             r"(?:dump|output|list).*(?:all|your).*(?:data|information)",
-        ],
-        "role_manipulation": [
+        ),
+        "role_manipulation": (
             r"(?:dan|developer|admin).*mode",
             r"jailbreak",
             r"bypass.*(?:filter|safety|security)",
             r"(?:evil|dark|shadow).*(?:mode|version)",
-        ],
-        "encoding_tricks": [
+        ),
+        "encoding_tricks": (
             r"base64",
             r"\\x[0-9a-f]{2}",
             r"&#x?[0-9a-f]+;",
             r"unicode.*(?:bypass|escape)",
-        ],
-        "delimiter_injection": [
+        ),
+        "delimiter_injection": (
             r"```.*system",
-            r"\[INST\]",
+            r"\[inst\]",
             r"<\|.*\|>",
             r"###.*instruction",
-        ],
+        ),
     }
 
-    JAILBREAK_PHRASES = [
+    JAILBREAK_PHRASES = (
         "do anything now",
         "hypothetically speaking",
         "for educational purposes",
@@ -395,36 +661,49 @@ class PromptSecurityAnalyzer:
         "ignore ethics",
         "no restrictions",
         "unrestricted mode",
-    ]
+    )
+
+    # One alternation per technique, used as a gate: a hit means at least one
+    # of the technique's patterns matches. Techniques are kept separate so a
+    # greedy ".*" in one cannot swallow the match of another. Every pattern
+    # with a gap goes through line_anchored so no scan is quadratic.
+    _INJECTION_RES = {
+        technique: re.compile("|".join(f"(?:{line_anchored(p)})" for p in patterns), re.MULTILINE)
+        for technique, patterns in INJECTION_PATTERNS.items()
+    }
+    # The reported pattern is the first one in list order that matches, not
+    # the alternative that happens to match earliest in the prompt
+    _PATTERN_RES = {
+        technique: tuple(re.compile(line_anchored(p), re.MULTILINE) for p in patterns)
+        for technique, patterns in INJECTION_PATTERNS.items()
+    }
+    _JAILBREAK_RE = re.compile("|".join(map(re.escape, JAILBREAK_PHRASES)))
+    # Single pass over every pattern: most prompts are clean, and a miss here
+    # proves no per-technique regex can match
+    _ANY_RE = re.compile("|".join(
+        [f"(?:{line_anchored(p)})" for patterns in INJECTION_PATTERNS.values() for p in patterns]
+        + [re.escape(phrase) for phrase in JAILBREAK_PHRASES]
+    ), re.MULTILINE)
 
     @classmethod
-    def analyze(cls, prompt: str) -> Dict[str, Any]:
+    def analyze(cls, prompt: "str | PromptContext") -> Dict[str, Any]:
         """Analyze prompt for security threats"""
-        prompt_lower = prompt.lower()
-        threats = []
-        techniques = []
-
-        # Check injection patterns
-        for technique, patterns in cls.INJECTION_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, prompt_lower):
-                    threats.append({
-                        "technique": technique,
-                        "pattern": pattern,
-                        "severity": "high" if technique in ["system_override", "role_manipulation"] else "medium"
-                    })
-                    techniques.append(technique)
-                    break
+        found = cls._scan(PromptContext.of(prompt))
+        if not found:
+            # Clean (or empty) prompt: nothing to score
+            return {
+                "security_score": 1.0,
+                "threats": [],
+                "techniques_detected": [],
+                "is_safe": 1.0 >= Config.SECURITY_SCORE_THRESHOLD,
+                "risk_level": RiskLevel.LOW,
+            }
 
-        # Check jailbreak phrases
-        for phrase in cls.JAILBREAK_PHRASES:
-            if phrase in prompt_lower:
-                threats.append({
-                    "technique": "jailbreak",
-                    "pattern": phrase,
-                    "severity": "high"
-                })
-                techniques.append("jailbreak")
+        threats = [
+            {"technique": technique, "pattern": pattern, "severity": severity}
+            for technique, pattern, severity in found
+        ]
+        techniques = [threat["technique"] for threat in threats]
 
         # Calculate security score (1.0 = safe, 0.0 = dangerous)
         base_score = 1.0
@@ -441,11 +720,46 @@ class PromptSecurityAnalyzer:
         return {
             "security_score": security_score,
             "threats": threats,
-            "techniques_detected": list(set(techniques)),
+            "techniques_detected": list(dict.fromkeys(techniques)),
             "is_safe": security_score >= Config.SECURITY_SCORE_THRESHOLD,
             "risk_level": cls._calculate_risk_level(security_score),
         }
 
+    @classmethod
+    def analyze_batch(cls, prompts: Iterable["str | PromptContext"]) -> List[Dict[str, Any]]:
+        """Analyze several prompts; results are in input order"""
+        return [cls.analyze(prompt) for prompt in prompts]
+
+    @classmethod
+    @functools.lru_cache(maxsize=Config.ANALYSIS_CACHE_SIZE)
+    def _scan(cls, ctx: PromptContext) -> tuple:
+        """Memoized scan, immutable: ((technique, pattern, severity), ...)"""
+        prompt_lower = ctx.lower
+        if not cls._ANY_RE.search(prompt_lower):
+            return ()
+        threats = []
+
+        # Check injection patterns
+        for technique, regex in cls._INJECTION_RES.items():
+            if regex.search(prompt_lower):
+                pattern = next(
+                    p for p, compiled in zip(cls.INJECTION_PATTERNS[technique], cls._PATTERN_RES[technique])
+                    if compiled.search(prompt_lower)
+                )
+                threats.append((
+                    technique,
+                    pattern,
+                    "high" if technique in ["system_override", "role_manipulation"] else "medium",
+                ))
+
+        # Check jailbreak phrases; substring tests so overlapping phrases all count
+        if cls._JAILBREAK_RE.search(prompt_lower):
+            for phrase in cls.JAILBREAK_PHRASES:
+                if phrase in prompt_lower:
+                    threats.append(("jailbreak", phrase, "high"))
+
+        return tuple(threats)
+
     @classmethod
     def _calculate_risk_level(cls, score: float) -> RiskLevel:
         if score >= 0.9:
@@ -465,11 +779,11 @@ class SemanticDriftDetector:
     """Detect semantic drift in prompts"""
 
     # Reference topics for baseline
-    BASELINE_TOPICS = {
+    BASELINE_TOPICS = frozenset({
         "technology", "software", "computer", "data", "system",
         "application", "service", "api", "database", "cloud",
         "security", "network", "performance", "monitoring", "analytics"
-    }
+    })
 
     # Out-of-domain indicators
     OOD_INDICATORS = {
@@ -486,32 +800,22 @@ class SemanticDriftDetector:
         "long_prompt": 500,  # character threshold
     }
 
+    # All OOD indicators in one pass; the lookahead also reports indicators
+    # that overlap in the text, matching the per-indicator substring test
+    _OOD_SETS = {domain: frozenset(inds) for domain, inds in OOD_INDICATORS.items()}
+    _OOD_RE = re.compile("(?=(%s))" % "|".join(
+        re.escape(ind) for inds in OOD_INDICATORS.values() for ind in inds
+    ))
+    _BASELINE_SIZE = max(len(BASELINE_TOPICS), 1)
+    _NESTED_RE = re.compile(line_anchored(COMPLEXITY_PATTERNS["nested_instructions"]), re.MULTILINE)
+    _MULTI_REQUEST_RE = re.compile(line_anchored(COMPLEXITY_PATTERNS["multiple_requests"]), re.MULTILINE)
+
     @classmethod
-    def analyze(cls, prompt: str, scenario: str) -> Dict[str, Any]:
+    def analyze(cls, prompt: "str | PromptContext", scenario: str) -> Dict[str, Any]:
         """Analyze semantic drift"""
-        prompt_lower = prompt.lower()
-        words = set(re.findall(r'\b\w+\b', prompt_lower))
-
-        # Calculate topic overlap with baseline
-        baseline_overlap = len(words & cls.BASELINE_TOPICS) / max(len(cls.BASELINE_TOPICS), 1)
-
-        # Detect out-of-domain drift
-        ood_scores = {}
-        for domain, indicators in cls.OOD_INDICATORS.items():
-            matches = sum(1 for ind in indicators if ind in prompt_lower)
-            ood_scores[domain] = matches / len(indicators)
-
-        max_ood_domain = max(ood_scores, key=ood_scores.get)
-        max_ood_score = ood_scores[max_ood_domain]
-
-        # Complexity drift
-        complexity_score = 0.0
-        if len(prompt) > cls.COMPLEXITY_PATTERNS["long_prompt"]:
-            complexity_score += 0.3
-        if re.search(cls.COMPLEXITY_PATTERNS["nested_instructions"], prompt_lower):
-            complexity_score += 0.2
-        if re.search(cls.COMPLEXITY_PATTERNS["multiple_requests"], prompt_lower):
-            complexity_score += 0.2
+        baseline_overlap, max_ood_domain, max_ood_score, complexity_score = cls._measure(
+            PromptContext.of(prompt)
+        )
 
         # Calculate overall drift factor
         drift_factor = max(
@@ -524,7 +828,7 @@ class SemanticDriftDetector:
         if scenario in ("baseline", "after-mitigation"):
             drift_factor *= 0.3
         elif scenario == "drift":
-            drift_factor = max(drift_factor, random.uniform(0.5, 0.9))
+            drift_factor = max(drift_factor, 0.5 + 0.4 * _RNG.random())
 
         return {
             "drift_factor": round(min(1.0, drift_factor), 3),
@@ -540,18 +844,116 @@ class SemanticDriftDetector:
             "alert": drift_factor > Config.DRIFT_ALERT_THRESHOLD,
         }
 
+    @classmethod
+    @functools.lru_cache(maxsize=Config.ANALYSIS_CACHE_SIZE)
+    def _measure(cls, ctx: PromptContext) -> tuple:
+        """Memoized scenario-independent scores:
+        (baseline_overlap, ood_domain, ood_score, complexity_score)"""
+        prompt_lower = ctx.lower
+        words = ctx.words
+
+        # Calculate topic overlap with baseline
+        baseline_overlap = len(words & cls.BASELINE_TOPICS) / cls._BASELINE_SIZE
+
+        # Detect out-of-domain drift
+        found = {m.group(1) for m in cls._OOD_RE.finditer(prompt_lower)}
+        ood_scores = {
+            domain: len(found & indicators) / len(indicators)
+            for domain, indicators in cls._OOD_SETS.items()
+        }
+
+        max_ood_domain = max(ood_scores, key=ood_scores.get)
+        max_ood_score = ood_scores[max_ood_domain]
+
+        # Complexity drift
+        complexity_score = 0.0
+        if len(ctx.raw) > cls.COMPLEXITY_PATTERNS["long_prompt"]:
+            complexity_score += 0.3
+        if cls._NESTED_RE.search(prompt_lower):
+            complexity_score += 0.2
+        if cls._MULTI_REQUEST_RE.search(prompt_lower):
+            complexity_score += 0.2
+
+        return baseline_overlap, max_ood_domain, max_ood_score, complexity_score
+
+
+def cache_hit_ratio(cached) -> float:
+    """Hit ratio of an lru_cache-wrapped callable"""
+    info = cached.cache_info()
+    total = info.hits + info.misses
+    return info.hits / total if total else 0.0
+
+
+for _analyzer, _cached in (
+    ("prompt_context", PromptContext.build),
+    ("pii", PIIDetector._scan),
+    ("security", PromptSecurityAnalyzer._scan),
+    ("drift", SemanticDriftDetector._measure),
+):
+    ai_analysis_cache_hit_ratio.labels(analyzer=_analyzer).set_function(
+        functools.partial(cache_hit_ratio, _cached)
+    )
+
 
 # =============================================================================
 # GUARDRAILS SYSTEM (GAME CHANGER #4)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Guardrail:
     name: str
     description: str
     check: callable
     action: GuardrailAction
     enabled: bool = True
+    # Resolved once: action.value for result payloads, and the metric
+    # children this guardrail increments when it fires
+    action_label: str = field(init=False)
+    triggered_counter: Any = field(init=False, repr=False)
+    blocked_counter: Any = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.action_label = self.action.value
+        self.triggered_counter = guardrail_triggers[self.name, self.action_label]
+        self.blocked_counter = (
+            guardrail_blocked[self.name] if self.action is GuardrailAction.BLOCK else None
+        )
+
+
+@dataclass(slots=True)
+class GuardrailsContext:
+    """Scalars precomputed by /predict for the guardrail checks"""
+    prompt_length: int = 0
+    pii_count: int = 0
+    security_score: float = 1.0
+    rate_limited: bool = False
+    toxicity_detected: bool = False
+
+
+# Each guardrail check is one attribute read and one comparison against a
+# module constant.
+PROMPT_LENGTH_LIMIT = 10000
+INJECTION_SCORE_FLOOR = 0.3
+
+
+def check_pii_count(ctx: GuardrailsContext) -> bool:
+    return ctx.pii_count <= Config.PII_BLOCK_THRESHOLD
+
+
+def check_security_score(ctx: GuardrailsContext) -> bool:
+    return ctx.security_score >= INJECTION_SCORE_FLOOR
+
+
+def check_not_toxic(ctx: GuardrailsContext) -> bool:
+    return not ctx.toxicity_detected
+
+
+def check_not_rate_limited(ctx: GuardrailsContext) -> bool:
+    return not ctx.rate_limited
+
+
+def check_prompt_length(ctx: GuardrailsContext) -> bool:
+    return ctx.prompt_length <= PROMPT_LENGTH_LIMIT
 
 
 class GuardrailsEngine:
@@ -568,7 +970,7 @@ class GuardrailsEngine:
         self.guardrails.append(Guardrail(
             name="pii_protection",
             description="Block requests with excessive PII",
-            check=lambda ctx: PIIDetector.count_pii(ctx.get("pii_detected", {})) <= Config.PII_BLOCK_THRESHOLD,
+            check=check_pii_count,
             action=GuardrailAction.BLOCK,
         ))
 
@@ -576,7 +978,7 @@ class GuardrailsEngine:
         self.guardrails.append(Guardrail(
             name="injection_protection",
             description="Block prompt injection attempts",
-            check=lambda ctx: ctx.get("security_analysis", {}).get("security_score", 1.0) >= 0.3,
+            check=check_security_score,
             action=GuardrailAction.BLOCK,
         ))
 
@@ -584,7 +986,7 @@ class GuardrailsEngine:
         self.guardrails.append(Guardrail(
             name="toxicity_filter",
             description="Warn on potentially toxic content",
-            check=lambda ctx: not ctx.get("toxicity_detected", False),
+            check=check_not_toxic,
             action=GuardrailAction.WARN,
         ))
 
@@ -592,7 +994,7 @@ class GuardrailsEngine:
         self.guardrails.append(Guardrail(
             name="rate_limit",
             description="Enforce rate limiting",
-            check=lambda ctx: not ctx.get("rate_limited", False),
+            check=check_not_rate_limited,
             action=GuardrailAction.BLOCK,
         ))
 
@@ -600,11 +1002,11 @@ class GuardrailsEngine:
         self.guardrails.append(Guardrail(
             name="prompt_length",
             description="Limit prompt length",
-            check=lambda ctx: len(ctx.get("prompt", "")) <= 10000,
+            check=check_prompt_length,
             action=GuardrailAction.BLOCK,
         ))
 
-    def evaluate(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def evaluate(self, context: GuardrailsContext) -> Dict[str, Any]:
         """Evaluate all guardrails"""
         results = {
             "passed": True,
@@ -623,21 +1025,19 @@ class GuardrailsEngine:
                 passed = True  # Fail open
 
             if not passed:
+                action = guardrail.action
                 results["triggered"].append({
                     "name": guardrail.name,
-                    "action": guardrail.action.value,
+                    "action": guardrail.action_label,
                 })
 
-                ai_guardrail_triggers_total.labels(
-                    guardrail=guardrail.name,
-                    action=guardrail.action.value
-                ).inc()
+                guardrail.triggered_counter.inc()
 
-                if guardrail.action == GuardrailAction.BLOCK:
+                if action is GuardrailAction.BLOCK:
                     results["passed"] = False
                     results["action"] = GuardrailAction.BLOCK
-                    ai_guardrail_blocked_total.labels(reason=guardrail.name).inc()
-                elif guardrail.action == GuardrailAction.WARN:
+                    guardrail.blocked_counter.inc()
+                elif action is GuardrailAction.WARN:
                     results["warnings"].append(guardrail.name)
 
         return results
@@ -647,38 +1047,58 @@ class GuardrailsEngine:
 # CONVERSATION TRACKER (GAME CHANGER #5)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ConversationState:
     conversation_id: str
     user_id: Optional[str]
     turns: int = 0
-    start_time: float = field(default_factory=time.time)
-    last_activity: float = field(default_factory=time.time)
+    # time.monotonic() readings: only used for durations and expiry
+    start_time: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
     total_tokens: int = 0
-    quality_scores: List[float] = field(default_factory=list)
-    topics: List[str] = field(default_factory=list)
+    # Running aggregates: constant memory however long the conversation runs
+    quality_sum: float = 0.0
+    quality_count: int = 0
+    topics: deque = field(default_factory=lambda: deque(maxlen=Config.CONVERSATION_RECENT_TOPICS))
+
+    @property
+    def avg_quality(self) -> float:
+        return self.quality_sum / self.quality_count if self.quality_count else 0
 
 
 class ConversationTracker:
     """Track multi-turn conversations"""
 
-    def __init__(self, timeout_minutes: int = 30):
-        self.conversations: Dict[str, ConversationState] = {}
+    def __init__(self, timeout_minutes: int = 30, max_conversations: int = Config.MAX_CONVERSATIONS):
+        # Kept in last-activity order, so stale entries are always at the head
+        self.conversations: "OrderedDict[str, ConversationState]" = OrderedDict()
         self.timeout_seconds = timeout_minutes * 60
+        self.max_conversations = max_conversations
+        # No lock: only async routes and the sweeper task touch the tracker,
+        # all on the event loop, and no method awaits mid-update
 
     def get_or_create(self, conversation_id: Optional[str], user_id: Optional[str] = None) -> ConversationState:
         """Get existing or create new conversation"""
         if not conversation_id:
             conversation_id = str(uuid.uuid4())
 
-        if conversation_id in self.conversations:
-            conv = self.conversations[conversation_id]
-            conv.last_activity = time.time()
+        now = time.monotonic()
+        self.cleanup_stale(now)
+
+        conv = self.conversations.get(conversation_id)
+        if conv is not None:
+            conv.last_activity = now
+            self.conversations.move_to_end(conversation_id)
             return conv
 
+        if len(self.conversations) >= self.max_conversations:
+            self.end_conversation(next(iter(self.conversations)), now)
+
         conv = ConversationState(
             conversation_id=conversation_id,
             user_id=user_id,
+            start_time=now,
+            last_activity=now,
         )
         self.conversations[conversation_id] = conv
         ai_active_conversations.inc()
@@ -686,40 +1106,41 @@ class ConversationTracker:
 
     def record_turn(self, conversation_id: str, quality_score: float, tokens: int, topic: Optional[str] = None):
         """Record a conversation turn"""
-        if conversation_id not in self.conversations:
+        conv = self.conversations.get(conversation_id)
+        if conv is None:
             return
 
-        conv = self.conversations[conversation_id]
         conv.turns += 1
         conv.total_tokens += tokens
-        conv.quality_scores.append(quality_score)
+        conv.quality_sum += quality_score
+        conv.quality_count += 1
         if topic:
             conv.topics.append(topic)
 
         # Update metrics
-        turn_bucket = "1" if conv.turns == 1 else "2-5" if conv.turns <= 5 else "6-10" if conv.turns <= 10 else "10+"
-        ai_conversation_turns_total.labels(conversation_length=turn_bucket).inc()
+        ai_conversation_turns.observe(conv.turns)
 
-    def end_conversation(self, conversation_id: str):
-        """End and cleanup conversation"""
-        if conversation_id not in self.conversations:
-            return
+    def end_conversation(self, conversation_id: str, now: Optional[float] = None) -> bool:
+        """End and cleanup conversation; False if it was not tracked"""
+        conv = self.conversations.pop(conversation_id, None)
+        if conv is None:
+            return False
+        ai_active_conversations.dec()
 
-        conv = self.conversations[conversation_id]
-        duration = time.time() - conv.start_time
+        duration = (now if now is not None else time.monotonic()) - conv.start_time
         ai_conversation_duration_seconds.observe(duration)
-        ai_active_conversations.dec()
-        del self.conversations[conversation_id]
-
-    def cleanup_stale(self):
-        """Cleanup stale conversations"""
-        now = time.time()
-        stale = [
-            cid for cid, conv in self.conversations.items()
-            if now - conv.last_activity > self.timeout_seconds
-        ]
-        for cid in stale:
-            self.end_conversation(cid)
+        return True
+
+    def cleanup_stale(self, now: Optional[float] = None):
+        """Cleanup stale conversations (oldest first, stops at the first active one)"""
+        if now is None:
+            now = time.monotonic()
+        cutoff = now - self.timeout_seconds
+        while self.conversations:
+            cid, conv = next(iter(self.conversations.items()))
+            if conv.last_activity >= cutoff:
+                break
+            self.end_conversation(cid, now)
 
 
 # =============================================================================
@@ -735,27 +1156,97 @@ class AuditTrail:
 
     @staticmethod
     def generate_trace_id(request_id: str) -> str:
-        return hashlib.sha256(request_id.encode()).hexdigest()[:32]
+        return hashlib.sha256(request_id.encode(), usedforsecurity=False).hexdigest()[:32]
 
     @staticmethod
     def log_event(
         event_type: str,
         request_id: str,
         data: Dict[str, Any],
-        severity: str = "info"
+        severity: str = "info",
+        trace_id: Optional[str] = None,
     ):
-        """Log audit event"""
+        """Queue audit event; serialization and output happen in the flusher.
+
+        Callers logging several events for one request pass its precomputed trace_id.
+        """
         audit_record = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": utc_timestamp(),
             "event_type": event_type,
             "request_id": request_id,
-            "trace_id": AuditTrail.generate_trace_id(request_id),
+            "trace_id": trace_id or AuditTrail.generate_trace_id(request_id),
             "severity": severity,
             **data
         }
 
-        logger.info(json.dumps(audit_record, ensure_ascii=False))
-        ai_audit_events_total.labels(event_type=event_type, severity=severity).inc()
+        try:
+            AuditTrail._queue.put_nowait(audit_record)
+        except queue.Full:
+            ai_audit_events_dropped_total.inc()
+
+    _queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=Config.AUDIT_QUEUE_SIZE)
+    _flusher: Optional[threading.Thread] = None
+
+    @classmethod
+    def start_flusher(cls):
+        """Start the background thread that writes queued events"""
+        if cls._flusher is None:
+            cls._flusher = threading.Thread(target=cls._flush_loop, name="audit-flusher", daemon=True)
+            cls._flusher.start()
+
+    @classmethod
+    def stop_flusher(cls):
+        """Write every queued event, then stop the flusher"""
+        if cls._flusher is not None:
+            cls._queue.put(None)
+            cls._flusher.join()
+            cls._flusher = None
+
+    @classmethod
+    def _flush_loop(cls):
+        while True:
+            batch = [cls._queue.get()]
+            deadline = time.monotonic() + Config.AUDIT_FLUSH_INTERVAL_SECONDS
+            while batch[-1] is not None and len(batch) < Config.AUDIT_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(cls._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is None
+            if stopping:
+                batch.pop()
+            if batch:
+                try:
+                    cls._emit(batch)
+                except Exception as e:
+                    # A failed write loses this batch, not the flusher thread
+                    ai_audit_events_dropped_total.inc(len(batch))
+                    logger.error(orjson.dumps(
+                        {"event": "audit_flush_error", "dropped": len(batch), "message": str(e)}
+                    ).decode())
+            if stopping:
+                return
+
+    @staticmethod
+    def _emit(batch: List[Dict[str, Any]]):
+        """One log call per batch (one JSON object per line), grouped counter updates"""
+        # orjson emits UTF-8 directly (the ensure_ascii=False equivalent);
+        # default=str keeps one odd value from losing the whole batch
+        logger.info(b"\n".join(orjson.dumps(record, default=str) for record in batch).decode())
+
+        counts: Dict[Tuple[str, str], int] = {}
+        for record in batch:
+            key = (record["event_type"], record["severity"])
+            counts[key] = counts.get(key, 0) + 1
+        for key, count in counts.items():
+            audit_events[key].inc(count)
+
+
+AuditTrail.start_flusher()
 
 
 # =============================================================================
@@ -763,35 +1254,55 @@ class AuditTrail:
 # =============================================================================
 
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """Simple in-memory rate limiter (sliding window counter per client)"""
 
     def __init__(self):
-        self.requests: Dict[str, List[float]] = defaultdict(list)
+        self.window_seconds = Config.RATE_LIMIT_WINDOW_SECONDS
+        # client_id -> (window_index, current_count, previous_count)
+        self.windows: Dict[str, Tuple[int, int, int]] = {}
+        self._next_sweep = 0.0
 
     def is_allowed(self, client_id: str) -> bool:
         """Check if request is allowed"""
-        now = time.time()
-        window_start = now - Config.RATE_LIMIT_WINDOW_SECONDS
-
-        # Clean old requests
-        self.requests[client_id] = [
-            t for t in self.requests[client_id] if t > window_start
-        ]
-
-        if len(self.requests[client_id]) >= Config.RATE_LIMIT_REQUESTS:
-            ai_rate_limit_events_total.labels(reason="quota_exceeded", action="blocked").inc()
+        now = time.monotonic()
+        position = now / self.window_seconds
+        window = int(position)
+
+        if now >= self._next_sweep:
+            self._sweep(window)
+            self._next_sweep = now + self.window_seconds
+
+        last_window, current, previous = self.windows.get(client_id, (window, 0, 0))
+        if window != last_window:
+            # Roll forward; anything older than the previous window no longer counts
+            previous = current if window == last_window + 1 else 0
+            current = 0
+
+        # Previous window's count weighted by how much of it still overlaps
+        estimated = previous * (1.0 - (position - window)) + current
+        if estimated >= Config.RATE_LIMIT_REQUESTS:
+            self.windows[client_id] = (window, current, previous)
+            rate_limit_blocked.inc()
             return False
 
-        self.requests[client_id].append(now)
+        self.windows[client_id] = (window, current + 1, previous)
         return True
 
+    def _sweep(self, window: int):
+        """Forget clients with no request in the current or previous window"""
+        idle = [cid for cid, (last_window, _, _) in self.windows.items() if window - last_window > 1]
+        for cid in idle:
+            del self.windows[cid]
+
 
 # =============================================================================
 # PYDANTIC MODELS
 # =============================================================================
 
 class PredictRequest(BaseModel):
-    prompt: str
+    model_config = ConfigDict(extra="ignore")
+
+    prompt: str = Field(..., max_length=Config.MAX_PROMPT_CHARS)
     scenario: str = "baseline"
     conversation_id: Optional[str] = None
     user_id: Optional[str] = None
@@ -868,77 +1379,155 @@ class GuardrailConfigRequest(BaseModel):
 # HELPER FUNCTIONS
 # =============================================================================
 
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") of the last timestamp issued
+_timestamp_second: tuple[int, str] = (-1, "")
+
+
+def utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with microseconds and a Z suffix.
+
+    The date/time part is formatted once per second and reused.
+    """
+    global _timestamp_second
+    second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _timestamp_second
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_second = (second, prefix)
+    return f"{prefix}.{micros:06d}Z"
+
+
+# Every accepted scenario alias -> (tag, mode)
+SCENARIO_ALIASES = {
+    "a": ("baseline", "nominal"),
+    "baseline": ("baseline", "nominal"),
+    "nominal": ("baseline", "nominal"),
+    "after-mitigation": ("after-mitigation", "nominal"),
+    "mitigated": ("after-mitigation", "nominal"),
+    "b": ("drift", "drift"),
+    "drift": ("drift", "drift"),
+    "c": ("latency-spike", "stress"),
+    "latency-spike": ("latency-spike", "stress"),
+    "stress": ("latency-spike", "stress"),
+    "prompt-injection": ("prompt-injection", "risky"),
+    "injection": ("prompt-injection", "risky"),
+    "high-risk": ("high-risk", "risky"),
+    "risk": ("high-risk", "risky"),
+    "toxic": ("toxic", "risky"),
+}
+
+
 def normalize_scenario(raw: str) -> tuple[str, str]:
     """Normalize scenario to (tag, mode)"""
     if not raw:
         return "baseline", "nominal"
 
-    s = raw.strip().lower()
-
-    mapping = {
-        ("a", "baseline", "nominal"): ("baseline", "nominal"),
-        ("after-mitigation", "mitigated"): ("after-mitigation", "nominal"),
-        ("b", "drift"): ("drift", "drift"),
-        ("c", "latency-spike", "stress"): ("latency-spike", "stress"),
-        ("prompt-injection", "injection"): ("prompt-injection", "risky"),
-        ("high-risk", "risk"): ("high-risk", "risky"),
-        ("toxic",): ("toxic", "risky"),
-    }
-
-    for keys, result in mapping.items():
-        if s in keys:
-            return result
+    # Clients almost always send a canonical alias verbatim
+    hit = SCENARIO_ALIASES.get(raw)
+    if hit is not None:
+        return hit
 
-    return s, "nominal"
+    # Unknown scenarios collapse to "other" so clients can't mint label values
+    return SCENARIO_ALIASES.get(raw.strip().lower()) or ("other", "nominal")
 
 
 def estimate_tokens(prompt: str, answer: str) -> tuple[int, int]:
-    """Estimate input/output tokens"""
-    input_tokens = int(len(prompt.split()) * random.uniform(1.2, 1.8))
-    output_tokens = int(len(answer.split()) * random.uniform(1.0, 1.4))
+    """Estimate input/output tokens.
+
+    Word counts are approximated by counting spaces (no list of substrings
+    is built); the result is scaled by a random factor anyway.
+    """
+    input_tokens = int((prompt.count(" ") + 1) * (1.2 + 0.6 * _RNG.random()))
+    output_tokens = int((answer.count(" ") + 1) * (1.0 + 0.4 * _RNG.random()))
     return max(1, input_tokens), max(1, output_tokens)
 
 
-def simulate_ai_response(prompt: str, scenario_tag: str, mode: str) -> tuple:
+# Simulation profiles, keyed by mode (latency) or scenario tag (the rest)
+LATENCY_RANGES = {
+    "nominal": (0.05, 0.15),
+    "drift": (0.1, 0.25),
+    "stress": (0.2, 0.6),
+    "risky": (0.15, 0.5),
+}
+DEFAULT_LATENCY_RANGE = (0.1, 0.3)
+
+QUALITY_RANGES = {
+    "baseline": (0.8, 0.95),
+    "after-mitigation": (0.8, 0.95),
+    "drift": (0.4, 0.85),
+    "latency-spike": (0.6, 0.9),
+}
+DEFAULT_QUALITY_RANGE = (0.3, 0.8)
+
+HALLUCINATION_RATES = {
+    "baseline": 0.0,
+    "after-mitigation": 0.0,
+    "drift": 0.3,
+    "latency-spike": 0.2,
+}
+DEFAULT_HALLUCINATION_RATE = 0.4
+
+COST_PER_CHAR_EUR = 0.0005
+COST_MULTIPLIERS = {"latency-spike": 1.5, "high-risk": 1.5, "toxic": 1.5}
+
+# Error budget burn-rate ranges, keyed by scenario tag
+BURN_RATE_RANGES = {
+    "baseline": (0.0, 0.1),
+    "after-mitigation": (0.0, 0.1),
+    "drift": (0.3, 0.7),
+    "latency-spike": (0.3, 0.7),
+}
+DEFAULT_BURN_RATE_RANGE = (0.5, 1.0)
+
+# The burn rate is cosmetic, so each range is sampled once at import and
+# replayed round-robin instead of drawing a fresh value per request
+BURN_RATE_SAMPLES = 1024  # power of two, indexed with a mask
+
+
+def _burn_rate_ring(low: float, high: float) -> tuple[float, ...]:
+    return tuple(low + (high - low) * _RNG.random() for _ in range(BURN_RATE_SAMPLES))
+
+
+_BURN_RATE_RINGS = {tag: _burn_rate_ring(*bounds) for tag, bounds in BURN_RATE_RANGES.items()}
+_DEFAULT_BURN_RATE_RING = _burn_rate_ring(*DEFAULT_BURN_RATE_RANGE)
+_burn_rate_index = itertools.count()
+
+# AI Act risk level for each risk_reason
+AI_ACT_RISK_LEVELS = {
+    "ok": "low",
+    "low_coherence": "medium",
+    "hallucination_detected": "medium",
+    "security_threat": "high",
+}
+
+# GDPR compliance score, keyed by (pii_found, security_threat)
+GDPR_COMPLIANCE_SCORES = {
+    (False, False): 1.0,
+    (True, False): 0.8,
+    (False, True): 0.7,
+    (True, True): 0.5,
+}
+
+
+async def simulate_ai_response(prompt: str, scenario_tag: str, mode: str) -> tuple:
     """Simulate AI response based on scenario"""
+    low, high = LATENCY_RANGES.get(mode, DEFAULT_LATENCY_RANGE)
+    base_latency = low + (high - low) * _RNG.random()
 
-    latency_ranges = {
-        "nominal": (0.05, 0.15),
-        "drift": (0.1, 0.25),
-        "stress": (0.2, 0.6),
-        "risky": (0.15, 0.5),
-    }
-
-    quality_ranges = {
-        "baseline": (0.8, 0.95),
-        "after-mitigation": (0.8, 0.95),
-        "drift": (0.4, 0.85),
-        "latency-spike": (0.6, 0.9),
-    }
-
-    hallucination_rates = {
-        "baseline": 0.0,
-        "after-mitigation": 0.0,
-        "drift": 0.3,
-        "latency-spike": 0.2,
-    }
-
-    lat_range = latency_ranges.get(mode, (0.1, 0.3))
-    base_latency = random.uniform(*lat_range)
-    time.sleep(base_latency)
+    low, high = QUALITY_RANGES.get(scenario_tag, DEFAULT_QUALITY_RANGE)
+    quality = low + (high - low) * _RNG.random()
 
-    qual_range = quality_ranges.get(scenario_tag, (0.3, 0.8))
-    quality = random.uniform(*qual_range)
+    hall_rate = HALLUCINATION_RATES.get(scenario_tag, DEFAULT_HALLUCINATION_RATE)
+    hallucination_suspected = _RNG.random() < hall_rate
 
-    hall_rate = hallucination_rates.get(scenario_tag, 0.4)
-    hallucination_suspected = random.random() < hall_rate
-
-    base_cost = 0.0005 * len(prompt)
-    if scenario_tag in ("latency-spike", "high-risk", "toxic"):
-        base_cost *= 1.5
+    base_cost = COST_PER_CHAR_EUR * len(prompt) * COST_MULTIPLIERS.get(scenario_tag, 1.0)
 
     answer = f"Réponse simulée pour '{scenario_tag}' avec score qualité {quality:.2f}."
 
+    # The response is fully built up front: once the simulated latency has
+    # elapsed, the coroutine returns straight away
+    await asyncio.sleep(base_latency)
+
     return answer, quality, hallucination_suspected, base_cost, base_latency
 
 
@@ -962,6 +1551,13 @@ def calculate_trust_index(risk_flag: bool, ai_act_risk_level: str, security_scor
 # FASTAPI APPLICATION
 # =============================================================================
 
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (for routes returning plain dicts)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 app = FastAPI(
     title="AI Reliability / Observability Platform",
     description="Enhanced AI monitoring with PII detection, guardrails, and advanced security",
@@ -980,15 +1576,18 @@ app.add_middleware(
 guardrails_engine = GuardrailsEngine()
 conversation_tracker = ConversationTracker()
 rate_limiter = RateLimiter()
-feedback_storage: Dict[str, Dict] = {}
+# Like the tracker, only mutated from async routes on the event loop
+feedback_storage: "OrderedDict[str, Dict]" = OrderedDict()
+# Running total of the ratings held in feedback_storage
+feedback_rating_sum = 0
 
 
 # =============================================================================
 # ENDPOINTS
 # =============================================================================
 
-@app.get("/")
-def root():
+@app.get("/", response_class=OrjsonResponse)
+async def root():
     """Root endpoint providing API information"""
     return {
         "service": "AI Observability Platform",
@@ -1007,25 +1606,50 @@ def root():
     }
 
 
-@app.get("/health", response_model=HealthResponse)
-def health():
+@app.get("/health", response_model=HealthResponse, response_class=OrjsonResponse)
+async def health():
     """Health check endpoint"""
-    return HealthResponse(
-        status="ok",
-        version=Config.SERVICE_VERSION,
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        active_conversations=len(conversation_tracker.conversations),
-    )
+    return OrjsonResponse({
+        "status": "ok",
+        "version": Config.SERVICE_VERSION,
+        "timestamp": utc_timestamp(),
+        "active_conversations": len(conversation_tracker.conversations),
+    })
+
+
+# Scrapers send the same Accept header every time: negotiate each one once
+negotiate_encoder = functools.lru_cache(maxsize=32)(choose_encoder)
+
+
+class MetricsCache:
+    """Short-lived cache of the encoded registry for concurrent scrapers,
+    one entry per negotiated exposition format"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, tuple[float, bytes]] = {}
+
+    def get(self, accept: str) -> tuple[bytes, str]:
+        encoder, content_type = negotiate_encoder(accept)
+        now = time.monotonic()
+        entry = self.entries.get(content_type)
+        if entry is None or now - entry[0] > self.ttl_seconds:
+            entry = self.entries[content_type] = (now, encoder(REGISTRY))
+        return entry[1], content_type
+
+
+metrics_cache = MetricsCache(Config.METRICS_CACHE_TTL_SECONDS)
 
 
 @app.get("/metrics")
-def metrics():
-    """Prometheus metrics endpoint"""
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+async def metrics(request: Request):
+    """Prometheus metrics endpoint (text or OpenMetrics, per Accept header)"""
+    body, content_type = metrics_cache.get(request.headers.get("accept", ""))
+    return Response(body, media_type=content_type)
 
 
-@app.post("/predict", response_model=PredictResponse)
-def predict(req: PredictRequest, request: Request):
+@app.post("/predict", response_model=PredictResponse, response_class=OrjsonResponse)
+async def predict(req: PredictRequest, request: Request):
     """
     Main prediction endpoint with full observability stack.
 
@@ -1038,87 +1662,76 @@ def predict(req: PredictRequest, request: Request):
     - Complete audit trail
     """
     request_id = AuditTrail.generate_request_id()
+    trace_id = AuditTrail.generate_trace_id(request_id)
     client_ip = request.client.host if request.client else "unknown"
 
     # Normalize scenario
     scenario_tag, mode = normalize_scenario(req.scenario)
     prompt = req.prompt or ""
-    endpoint = "/predict"
-    model = "demo-medium"
+    prompt_len = len(prompt)
 
-    # Update inflight
-    ai_inflight_requests.labels(endpoint=endpoint).inc()
-    ai_requests_total.labels(scenario=scenario_tag, endpoint=endpoint).inc()
+    requests_by_scenario[scenario_tag].inc()
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
-    with tracer.start_as_current_span("ai_predict") as span:
-        span.set_attribute("ai.request_id", request_id)
-        span.set_attribute("ai.prompt_length", len(prompt))
-        span.set_attribute("ai.scenario", scenario_tag)
-        span.set_attribute("ai.mode", mode)
+    # Request attributes go in at span creation, so blocked requests keep them
+    # too; the outcome is added in one set_attributes call at the end
+    span_attributes = {
+        "ai.request_id": request_id,
+        "ai.prompt_length": prompt_len,
+        "ai.scenario": scenario_tag,
+        "ai.mode": mode,
+    }
 
+    # The inflight gauge is decremented however the request ends (403, errors)
+    with inflight_predict.track_inprogress(), \
+            tracer.start_as_current_span("ai_predict", attributes=span_attributes) as span:
         # =====================================================================
         # GAME CHANGER #1: PII Detection
         # =====================================================================
-        pii_detected = PIIDetector.detect(prompt)
-        pii_count = PIIDetector.count_pii(pii_detected)
-        pii_redacted = False
-
-        for pii_type, matches in pii_detected.items():
-            ai_pii_detected_total.labels(
-                pii_type=pii_type.value,
-                action="detected"
-            ).inc(len(matches))
-
-        # Log PII detection audit event
-        if pii_count > 0:
-            AuditTrail.log_event(
-                "pii_detected",
-                request_id,
-                {"pii_types": [t.value for t in pii_detected.keys()], "count": pii_count},
-                severity="warning"
-            )
+        with tracer.start_as_current_span("pii") as pii_span:
+            prompt_ctx = PromptContext.build(prompt)
+            pii_detected = PIIDetector.detect(prompt_ctx)
+            pii_count = PIIDetector.count_pii(pii_detected)
+            pii_redacted = False
+            pii_span.set_attribute("ai.pii_count", pii_count)
+
+            for pii_type, matches in pii_detected.items():
+                pii_detected_by_type[pii_type.value].inc(len(matches))
+
+            # Log PII detection audit event (the flusher's orjson writes the
+            # PIIType members as their string values)
+            if pii_count > 0:
+                AuditTrail.log_event(
+                    "pii_detected",
+                    request_id,
+                    {"pii_types": tuple(pii_detected), "count": pii_count},
+                    severity="warning",
+                    trace_id=trace_id
+                )
 
         # =====================================================================
         # GAME CHANGER #2: Security Analysis
         # =====================================================================
-        security_analysis = PromptSecurityAnalyzer.analyze(prompt)
-        security_score = security_analysis["security_score"]
-
-        ai_prompt_security_score.observe(security_score)
-
-        for threat in security_analysis["threats"]:
-            ai_prompt_injection_attempts_total.labels(
-                technique=threat["technique"],
-                blocked=str(not security_analysis["is_safe"])
-            ).inc()
-
-        if not security_analysis["is_safe"]:
-            AuditTrail.log_event(
-                "security_threat",
-                request_id,
-                {"threats": security_analysis["threats"], "score": security_score},
-                severity="high"
-            )
-
-        # =====================================================================
-        # GAME CHANGER #3: Semantic Drift Detection
-        # =====================================================================
-        drift_analysis = SemanticDriftDetector.analyze(prompt, scenario_tag)
-        drift_factor = drift_analysis["drift_factor"]
-
-        for dimension, score in drift_analysis["dimensions"].items():
-            ai_input_drift_score.labels(scenario=scenario_tag, dimension=dimension).set(score)
-
-        if drift_analysis["alert"]:
-            ai_drift_alerts_total.labels(severity="warning").inc()
-            AuditTrail.log_event(
-                "drift_alert",
-                request_id,
-                {"drift_factor": drift_factor, "ood_domain": drift_analysis["ood_domain"]},
-                severity="warning"
-            )
+        with tracer.start_as_current_span("security") as security_span:
+            security_analysis = PromptSecurityAnalyzer.analyze(prompt_ctx)
+            security_score = security_analysis["security_score"]
+            security_span.set_attribute("ai.security_score", float(security_score))
+
+            ai_prompt_security_score.observe(security_score)
+
+            blocked_label = str(not security_analysis["is_safe"])
+            for threat in security_analysis["threats"]:
+                injection_attempts[bounded_label(threat["technique"], ALLOWED_TECHNIQUES), blocked_label].inc()
+
+            if not security_analysis["is_safe"]:
+                AuditTrail.log_event(
+                    "security_threat",
+                    request_id,
+                    {"threats": security_analysis["threats"], "score": security_score},
+                    severity="high",
+                    trace_id=trace_id
+                )
 
         # =====================================================================
         # GAME CHANGER #4: Rate Limiting Check
@@ -1128,25 +1741,27 @@ def predict(req: PredictRequest, request: Request):
         # =====================================================================
         # GAME CHANGER #5: Guardrails Evaluation
         # =====================================================================
-        guardrails_context = {
-            "prompt": prompt,
-            "pii_detected": pii_detected,
-            "security_analysis": security_analysis,
-            "rate_limited": rate_limited,
-            "toxicity_detected": scenario_tag == "toxic",
-        }
+        guardrails_context = GuardrailsContext(
+            prompt_length=prompt_len,
+            pii_count=pii_count,
+            security_score=security_score,
+            rate_limited=rate_limited,
+            toxicity_detected=scenario_tag == "toxic",
+        )
 
-        guardrails_result = guardrails_engine.evaluate(guardrails_context)
+        with tracer.start_as_current_span("guardrails") as guardrails_span:
+            guardrails_result = guardrails_engine.evaluate(guardrails_context)
+            guardrails_span.set_attribute("ai.guardrails.passed", guardrails_result["passed"])
 
         if not guardrails_result["passed"]:
-            ai_inflight_requests.labels(endpoint=endpoint).dec()
-            ai_requests_error_total.labels(scenario=scenario_tag, error_type="guardrail_blocked").inc()
+            errors_by_scenario[scenario_tag, "guardrail_blocked"].inc()
 
             AuditTrail.log_event(
                 "request_blocked",
                 request_id,
                 {"triggered": guardrails_result["triggered"]},
-                severity="warning"
+                severity="warning",
+                trace_id=trace_id
             )
 
             raise HTTPException(
@@ -1158,6 +1773,28 @@ def predict(req: PredictRequest, request: Request):
                 }
             )
 
+        # =====================================================================
+        # GAME CHANGER #3: Semantic Drift Detection
+        # (after guardrails: blocked requests skip it, and nothing above reads it)
+        # =====================================================================
+        with tracer.start_as_current_span("drift") as drift_span:
+            drift_analysis = SemanticDriftDetector.analyze(prompt_ctx, scenario_tag)
+            drift_factor = drift_analysis["drift_factor"]
+            drift_span.set_attribute("ai.drift_factor", float(drift_factor))
+
+            for dimension, score in drift_analysis["dimensions"].items():
+                drift_score_by_dimension[scenario_tag, dimension].set(score)
+
+            if drift_analysis["alert"]:
+                drift_alert_warning.inc()
+                AuditTrail.log_event(
+                    "drift_alert",
+                    request_id,
+                    {"drift_factor": drift_factor, "ood_domain": drift_analysis["ood_domain"]},
+                    severity="warning",
+                    trace_id=trace_id
+                )
+
         # =====================================================================
         # GAME CHANGER #6: Conversation Tracking
         # =====================================================================
@@ -1169,23 +1806,32 @@ def predict(req: PredictRequest, request: Request):
         # =====================================================================
         # Main AI Simulation
         # =====================================================================
-        try:
-            answer, quality, hallucination_suspected, estimated_cost, sim_latency = simulate_ai_response(
-                prompt, scenario_tag, mode
-            )
-            error = False
-        except Exception as e:
-            answer = "Erreur interne dans la simulation."
-            quality = 0.0
-            hallucination_suspected = False
-            estimated_cost = 0.0
-            sim_latency = 0.0
-            error = True
-            ai_requests_error_total.labels(scenario=scenario_tag, error_type="internal").inc()
-            logger.error(json.dumps({"event": "error", "request_id": request_id, "message": str(e)}))
-
-        elapsed = time.time() - start_time
-        latency_ms = elapsed * 1000.0
+        with tracer.start_as_current_span("simulate") as simulate_span:
+            try:
+                answer, quality, hallucination_suspected, estimated_cost, sim_latency = await simulate_ai_response(
+                    prompt, scenario_tag, mode
+                )
+                error = False
+            except Exception as e:
+                answer = "Erreur interne dans la simulation."
+                quality = 0.0
+                hallucination_suspected = False
+                estimated_cost = 0.0
+                sim_latency = 0.0
+                error = True
+                errors_by_scenario[scenario_tag, classify_error(e)].inc()
+                logger.error(orjson.dumps({"event": "error", "request_id": request_id, "message": str(e)}).decode())
+
+            if simulate_span.is_recording():
+                simulate_span.set_attributes({
+                    "ai.quality_score": float(quality),
+                    "ai.hallucination_suspected": bool(hallucination_suspected),
+                    "ai.estimated_cost_eur": float(estimated_cost),
+                })
+
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        elapsed = elapsed_ns / 1e9
+        latency_ms = elapsed_ns / 1e6
 
         # Token estimation
         in_toks, out_toks = estimate_tokens(prompt, answer)
@@ -1212,12 +1858,7 @@ def predict(req: PredictRequest, request: Request):
             risk_reason = "security_threat"
 
         # AI Act risk level
-        if not risk_flag:
-            ai_act_risk_level = "low"
-        elif risk_reason in ("low_coherence", "hallucination_detected"):
-            ai_act_risk_level = "medium"
-        else:
-            ai_act_risk_level = "high"
+        ai_act_risk_level = AI_ACT_RISK_LEVELS[risk_reason]
 
         # Trust index
         trust_index = calculate_trust_index(risk_flag, ai_act_risk_level, security_score)
@@ -1225,17 +1866,18 @@ def predict(req: PredictRequest, request: Request):
         # =====================================================================
         # Update Metrics
         # =====================================================================
-        ai_latency_seconds.labels(scenario=scenario_tag).observe(elapsed)
-        ai_response_quality_score.labels(scenario=scenario_tag).observe(quality)
+        latency_by_scenario[scenario_tag].observe(elapsed)
+        quality_by_scenario[scenario_tag].observe(quality)
         ai_quality_score.set(quality)
 
-        ai_tokens_input_total.labels(model=model).inc(in_toks)
-        ai_tokens_output_total.labels(model=model).inc(out_toks)
-        ai_cost_estimated_eur_total.inc(estimated_cost)
+        tokens_input_default.inc(in_toks)
+        tokens_output_default.inc(out_toks)
+        if estimated_cost:
+            ai_cost_estimated_eur_total.inc(estimated_cost)
 
         # SLI/SLO
         ai_sli_latency_requests_total.inc()
-        if elapsed > Config.SLO_LATENCY_THRESHOLD_MS / 1000:
+        if elapsed_ns > Config.SLO_LATENCY_THRESHOLD_MS * 1_000_000:
             ai_sli_latency_violations_total.inc()
 
         ai_sli_quality_requests_total.inc()
@@ -1245,29 +1887,23 @@ def predict(req: PredictRequest, request: Request):
         # Risk metrics
         if hallucination_suspected:
             severity = "high" if quality < 0.5 else "medium"
-            ai_hallucination_events_total.labels(detector="rule-engine", severity=severity).inc()
+            hallucination_by_severity[severity].inc()
 
         if risk_flag:
-            ai_risky_responses_total.labels(scenario=scenario_tag, risk_level=ai_act_risk_level).inc()
+            risky_by_scenario[scenario_tag, ai_act_risk_level].inc()
 
         if scenario_tag in ("toxic", "high-risk") or ai_act_risk_level == "high":
-            ai_toxicity_events_total.labels(severity="high", category=scenario_tag).inc()
+            toxicity_by_category[scenario_tag].inc()
 
-        ai_trust_index.labels(scenario=scenario_tag).set(trust_index)
+        trust_by_scenario[scenario_tag].set(trust_index)
 
         # Compliance score
-        compliance_base = 1.0 - (0.2 if pii_count > 0 else 0) - (0.3 if not security_analysis["is_safe"] else 0)
-        ai_compliance_score.labels(category="gdpr").set(max(0, compliance_base))
-        ai_compliance_score.labels(category="ai_act").set(trust_index)
+        compliance_gdpr.set(GDPR_COMPLIANCE_SCORES[pii_count > 0, not security_analysis["is_safe"]])
+        compliance_ai_act.set(trust_index)
 
         # Error budget
-        if scenario_tag in ("baseline", "after-mitigation"):
-            burn = random.uniform(0.0, 0.1)
-        elif scenario_tag in ("drift", "latency-spike"):
-            burn = random.uniform(0.3, 0.7)
-        else:
-            burn = random.uniform(0.5, 1.0)
-        ai_slo_error_budget_burn_rate.set(burn)
+        burn_ring = _BURN_RATE_RINGS.get(scenario_tag, _DEFAULT_BURN_RATE_RING)
+        ai_slo_error_budget_burn_rate.set(burn_ring[next(_burn_rate_index) & (BURN_RATE_SAMPLES - 1)])
 
         # Update conversation
         conversation_tracker.record_turn(
@@ -1276,37 +1912,32 @@ def predict(req: PredictRequest, request: Request):
             in_toks + out_toks
         )
 
-        # Decrease inflight
-        ai_inflight_requests.labels(endpoint=endpoint).dec()
-
         # =====================================================================
         # OpenTelemetry Span Attributes
         # =====================================================================
-        span.set_attribute("ai.quality_score", float(quality))
-        span.set_attribute("ai.hallucination_suspected", bool(hallucination_suspected))
-        span.set_attribute("ai.estimated_cost_eur", float(estimated_cost))
-        span.set_attribute("ai.latency_ms", float(latency_ms))
-        span.set_attribute("ai.security_score", float(security_score))
-        span.set_attribute("ai.pii_count", int(pii_count))
-        span.set_attribute("ai.drift_factor", float(drift_factor))
-        span.set_attribute("ai.trust_index", float(trust_index))
-        span.set_attribute("ai.conversation_id", conversation.conversation_id)
-        span.set_attribute("ai.conversation_turn", conversation.turns)
-
-        span.set_attribute("ai.eval.mode", mode)
-        span.set_attribute("ai.eval.coherence", float(coherence))
-        span.set_attribute("ai.eval.risk_flag", bool(risk_flag))
-        span.set_attribute("ai.eval.risk_reason", risk_reason)
-        span.set_attribute("ai.eval.ai_act_risk_level", ai_act_risk_level)
+        # Section results live on the pii/security/guardrails/drift/simulate
+        # child spans; sampled-out requests skip building the dict entirely
+        if span.is_recording():
+            span.set_attributes({
+                "ai.latency_ms": float(latency_ms),
+                "ai.trust_index": float(trust_index),
+                "ai.conversation_id": conversation.conversation_id,
+                "ai.conversation_turn": conversation.turns,
+                "ai.eval.mode": mode,
+                "ai.eval.coherence": float(coherence),
+                "ai.eval.risk_flag": bool(risk_flag),
+                "ai.eval.risk_reason": risk_reason,
+                "ai.eval.ai_act_risk_level": ai_act_risk_level,
+            })
 
         # =====================================================================
         # Audit Trail
         # =====================================================================
-        AuditTrail.log_event(
-            "ai_predict",
-            request_id,
-            {
-                "prompt": prompt[:200] + "..." if len(prompt) > 200 else prompt,
+        routine = not (error or risk_flag or hallucination or guardrails_result["warnings"])
+        if not routine or _RNG.random() * Config.LOG_SAMPLE_RATE < 1:
+            audit_details = {
+                "prompt_len": prompt_len,
+                "prompt_sha1": hashlib.sha1(prompt.encode(), usedforsecurity=False).hexdigest()[:16],
                 "scenario": scenario_tag,
                 "quality_score": quality,
                 "security_score": security_score,
@@ -1321,70 +1952,83 @@ def predict(req: PredictRequest, request: Request):
                 "conversation_turn": conversation.turns,
                 "guardrails_warnings": guardrails_result["warnings"],
                 "error": error,
-            },
-            severity="info" if not risk_flag else "warning"
-        )
+            }
+            if Config.LOG_PROMPT_PREVIEW:
+                audit_details["prompt_preview"] = prompt[:Config.PROMPT_PREVIEW_CHARS]
+
+            AuditTrail.log_event(
+                "ai_predict",
+                request_id,
+                audit_details,
+                severity="info" if not risk_flag else "warning",
+                trace_id=trace_id
+            )
 
         # =====================================================================
         # Response
         # =====================================================================
-        return PredictResponse(
-            request_id=request_id,
-            prompt=prompt,
-            scenario=scenario_tag,
-            answer=answer,
-            quality_score=float(quality),
-            coherence=float(coherence),
-            hallucination_suspected=bool(hallucination_suspected),
-            hallucination=bool(hallucination),
-            estimated_cost_eur=float(estimated_cost),
-            latency_ms=float(latency_ms),
-            tokens_input=in_toks,
-            tokens_output=out_toks,
-            mode=mode,
-            risk_flag=bool(risk_flag),
-            risk_reason=risk_reason,
-            ai_act_risk_level=ai_act_risk_level,
-            security_score=float(security_score),
-            pii_detected_count=pii_count,
-            pii_redacted=pii_redacted,
-            drift_factor=float(drift_factor),
-            drift_alert=drift_analysis["alert"],
-            guardrails_passed=guardrails_result["passed"],
-            guardrails_warnings=guardrails_result["warnings"],
-            trust_index=float(trust_index),
-            conversation_id=conversation.conversation_id,
-            conversation_turn=conversation.turns,
-        )
-
-
-@app.post("/feedback", response_model=FeedbackResponse)
-def submit_feedback(feedback: FeedbackRequest):
+        return OrjsonResponse({
+            "request_id": request_id,
+            "prompt": prompt,
+            "scenario": scenario_tag,
+            "answer": answer,
+            "quality_score": float(quality),
+            "coherence": float(coherence),
+            "hallucination_suspected": bool(hallucination_suspected),
+            "hallucination": bool(hallucination),
+            "estimated_cost_eur": float(estimated_cost),
+            "latency_ms": float(latency_ms),
+            "tokens_input": in_toks,
+            "tokens_output": out_toks,
+            "mode": mode,
+            "risk_flag": bool(risk_flag),
+            "risk_reason": risk_reason,
+            "ai_act_risk_level": ai_act_risk_level,
+            "security_score": float(security_score),
+            "pii_detected_count": pii_count,
+            "pii_redacted": pii_redacted,
+            "drift_factor": float(drift_factor),
+            "drift_alert": drift_analysis["alert"],
+            "guardrails_passed": guardrails_result["passed"],
+            "guardrails_warnings": guardrails_result["warnings"],
+            "trust_index": float(trust_index),
+            "conversation_id": conversation.conversation_id,
+            "conversation_turn": conversation.turns,
+        })
+
+
+@app.post("/feedback", response_model=FeedbackResponse, response_class=OrjsonResponse)
+async def submit_feedback(feedback: FeedbackRequest):
     """
     GAME CHANGER: User feedback endpoint for continuous improvement.
     """
+    global feedback_rating_sum
     feedback_id = str(uuid.uuid4())
 
-    # Store feedback
-    feedback_storage[feedback_id] = {
+    record = {
         "feedback_id": feedback_id,
         "request_id": feedback.request_id,
         "rating": feedback.rating,
         "category": feedback.category,
         "comment": feedback.comment,
         "conversation_id": feedback.conversation_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": utc_timestamp(),
     }
 
     # Update metrics
     rating_label = str(feedback.rating)
-    category_label = feedback.category or "general"
-    ai_user_feedback_total.labels(rating=rating_label, category=category_label).inc()
-
-    # Update satisfaction gauge (rolling average approximation)
-    all_ratings = [f["rating"] for f in feedback_storage.values()]
-    avg_rating = sum(all_ratings) / len(all_ratings) if all_ratings else 3.0
-    ai_user_satisfaction_score.set(avg_rating)
+    category_label = bounded_label(feedback.category or "general", ALLOWED_FEEDBACK_CATEGORIES)
+    feedback_by_rating[rating_label, category_label].inc()
+
+    # Store feedback and update satisfaction gauge (mean of stored ratings,
+    # maintained incrementally)
+    feedback_storage[feedback_id] = record
+    feedback_rating_sum += feedback.rating
+    if len(feedback_storage) > Config.FEEDBACK_STORAGE_SIZE:
+        _, evicted = feedback_storage.popitem(last=False)
+        feedback_rating_sum -= evicted["rating"]
+        ai_feedback_evicted_total.inc()
+    ai_user_satisfaction_score.set(feedback_rating_sum / len(feedback_storage))
 
     # Audit trail
     AuditTrail.log_event(
@@ -1398,42 +2042,41 @@ def submit_feedback(feedback: FeedbackRequest):
         severity="info"
     )
 
-    return FeedbackResponse(
-        success=True,
-        message="Feedback recorded successfully",
-        feedback_id=feedback_id,
-    )
+    return OrjsonResponse({
+        "success": True,
+        "message": "Feedback recorded successfully",
+        "feedback_id": feedback_id,
+    })
 
 
-@app.get("/conversations/{conversation_id}")
-def get_conversation(conversation_id: str):
+@app.get("/conversations/{conversation_id}", response_class=OrjsonResponse)
+async def get_conversation(conversation_id: str):
     """Get conversation state"""
-    if conversation_id not in conversation_tracker.conversations:
+    conv = conversation_tracker.conversations.get(conversation_id)
+    if conv is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    conv = conversation_tracker.conversations[conversation_id]
     return {
         "conversation_id": conv.conversation_id,
         "user_id": conv.user_id,
         "turns": conv.turns,
-        "duration_seconds": time.time() - conv.start_time,
+        "duration_seconds": time.monotonic() - conv.start_time,
         "total_tokens": conv.total_tokens,
-        "avg_quality": sum(conv.quality_scores) / len(conv.quality_scores) if conv.quality_scores else 0,
+        "avg_quality": conv.avg_quality,
     }
 
 
-@app.delete("/conversations/{conversation_id}")
-def end_conversation(conversation_id: str):
+@app.delete("/conversations/{conversation_id}", response_class=OrjsonResponse)
+async def end_conversation(conversation_id: str):
     """End a conversation"""
-    if conversation_id not in conversation_tracker.conversations:
+    if not conversation_tracker.end_conversation(conversation_id):
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    conversation_tracker.end_conversation(conversation_id)
     return {"status": "ended", "conversation_id": conversation_id}
 
 
-@app.put("/guardrails/config")
-def configure_guardrail(config: GuardrailConfigRequest):
+@app.put("/guardrails/config", response_class=OrjsonResponse)
+async def configure_guardrail(config: GuardrailConfigRequest):
     """Configure guardrail enabled state"""
     for guardrail in guardrails_engine.guardrails:
         if guardrail.name == config.guardrail_name:
@@ -1443,15 +2086,15 @@ def configure_guardrail(config: GuardrailConfigRequest):
     raise HTTPException(status_code=404, detail=f"Guardrail '{config.guardrail_name}' not found")
 
 
-@app.get("/guardrails")
-def list_guardrails():
+@app.get("/guardrails", response_class=OrjsonResponse)
+async def list_guardrails():
     """List all guardrails and their status"""
     return {
         "guardrails": [
             {
                 "name": g.name,
                 "description": g.description,
-                "action": g.action.value,
+                "action": g.action_label,
                 "enabled": g.enabled,
             }
             for g in guardrails_engine.guardrails
@@ -1459,8 +2102,8 @@ def list_guardrails():
     }
 
 
-@app.get("/stats")
-def get_stats():
+@app.get("/stats", response_class=OrjsonResponse)
+async def get_stats():
     """Get current platform statistics"""
     return {
         "version": Config.SERVICE_VERSION,
@@ -1482,28 +2125,52 @@ def get_stats():
 # STARTUP EVENT
 # =============================================================================
 
+conversation_sweeper: Optional[asyncio.Task] = None
+
+
+async def sweep_stale_conversations():
+    """Expire idle conversations even when no new requests arrive"""
+    while True:
+        await asyncio.sleep(Config.CONVERSATION_SWEEP_SECONDS)
+        conversation_tracker.cleanup_stale()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize platform on startup"""
-    logger.info(json.dumps({
+    global conversation_sweeper
+    AuditTrail.start_flusher()
+    conversation_sweeper = asyncio.create_task(sweep_stale_conversations())
+
+    logger.info(orjson.dumps({
         "event": "startup",
         "version": Config.SERVICE_VERSION,
         "service": Config.SERVICE_NAME,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-    }))
+        "timestamp": utc_timestamp(),
+    }).decode())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    if conversation_sweeper is not None:
+        conversation_sweeper.cancel()
+
     # End all conversations
     for conv_id in list(conversation_tracker.conversations.keys()):
         conversation_tracker.end_conversation(conv_id)
 
-    logger.info(json.dumps({
+    # Write out queued audit events
+    AuditTrail.stop_flusher()
+
+    logger.info(orjson.dumps({
         "event": "shutdown",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-    }))
+        "timestamp": utc_timestamp(),
+    }).decode())
+
+    # Drain queued log records before the process exits
+    if log_listener is not None:
+        log_listener.stop()
 
 
 # =============================================================================
@@ -1512,4 +2179,4 @@ async def shutdown_event():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, access_log=False)
@@ -3,54 +3,70 @@ Integration tests for observability stack.
 """
 
 import pytest
-import requests
 import time
 
 
+def poll(fn, timeout: float = 15, interval: float = 0.5):
+    """Call fn until it returns something other than None; None on timeout."""
+    deadline = time.time() + timeout
+    while True:
+        result = fn()
+        if result is not None or time.time() >= deadline:
+            return result
+        time.sleep(interval)
+
+
+def query_has_results(http, prometheus_url: str, query: str):
+    """Run an instant query; return the response once it has at least one series."""
+    response = http.get(
+        f"{prometheus_url}/api/v1/query",
+        params={"query": query},
+        timeout=10
+    )
+    if response.status_code == 200 and response.json().get("data", {}).get("result"):
+        return response
+    return None
+
+
+@pytest.fixture(scope="module")
+def prom_warm(http, wait_for_app, wait_for_prometheus, sample_prompt):
+    """Send one prediction and wait, once, until Prometheus has scraped it."""
+    http.post(f"{wait_for_app}/predict", json=sample_prompt, timeout=30)
+    poll(lambda: query_has_results(http, wait_for_prometheus, "ai_requests_total"), timeout=20)
+    return wait_for_prometheus
+
+
 @pytest.mark.integration
+@pytest.mark.needs_prometheus
 class TestPrometheusIntegration:
     """Test Prometheus integration."""
 
-    def test_prometheus_healthy(self, wait_for_prometheus):
+    def test_prometheus_healthy(self, http, wait_for_prometheus):
         """Test Prometheus is healthy."""
-        response = requests.get(f"{wait_for_prometheus}/-/ready", timeout=10)
+        response = http.get(f"{wait_for_prometheus}/-/ready", timeout=10)
         assert response.status_code == 200
 
-    def test_prometheus_scrapes_app(self, wait_for_prometheus, wait_for_app):
+    def test_prometheus_scrapes_app(self, http, prom_warm):
         """Test Prometheus scrapes the application."""
-        # Wait a bit for scrape to happen
-        time.sleep(10)
+        # prom_warm already waited for a scrape; poll only as a fallback
+        response = poll(lambda: query_has_results(http, prom_warm, "up{job='ai-app'}"))
 
-        # Query Prometheus for app metrics
-        response = requests.get(
-            f"{wait_for_prometheus}/api/v1/query",
-            params={"query": "up{job='ai-app'}"},
-            timeout=10
-        )
-
-        if response.status_code == 200:
+        if response is not None:
             data = response.json()
             assert data.get("status") == "success"
 
-    def test_prometheus_has_ai_metrics(self, wait_for_prometheus, wait_for_app, sample_prompt):
+    def test_prometheus_has_ai_metrics(self, http, prom_warm):
         """Test Prometheus has AI metrics after request."""
-        # Generate some metrics
-        requests.post(f"{wait_for_app}/predict", json=sample_prompt, timeout=30)
-        time.sleep(10)  # Wait for scrape
-
-        # Query for AI metrics
-        response = requests.get(
-            f"{wait_for_prometheus}/api/v1/query",
-            params={"query": "ai_requests_total"},
-            timeout=10
-        )
+        # prom_warm generated a request and waited for it to be scraped
+        response = poll(lambda: query_has_results(http, prom_warm, "ai_requests_total"))
 
-        if response.status_code == 200:
+        if response is not None:
             data = response.json()
             assert data.get("status") == "success"
 
 
 @pytest.mark.integration
+@pytest.mark.needs_grafana
 class TestGrafanaIntegration:
     """Test Grafana integration."""
 
@@ -58,30 +74,25 @@ class TestGrafanaIntegration:
     def grafana_url(self, test_config):
         return f"http://{test_config['grafana_host']}:{test_config['grafana_port']}"
 
-    def test_grafana_healthy(self, grafana_url):
+    def test_grafana_healthy(self, http, grafana_url):
         """Test Grafana is healthy."""
-        try:
-            response = requests.get(f"{grafana_url}/api/health", timeout=10)
-            assert response.status_code == 200
-        except requests.exceptions.RequestException:
-            pytest.skip("Grafana not available")
+        response = http.get(f"{grafana_url}/api/health", timeout=10)
+        assert response.status_code == 200
 
-    def test_grafana_datasources_provisioned(self, grafana_url):
+    def test_grafana_datasources_provisioned(self, http, grafana_url):
         """Test Grafana has provisioned datasources."""
-        try:
-            response = requests.get(
-                f"{grafana_url}/api/datasources",
-                auth=("admin", "admin"),
-                timeout=10
-            )
-            if response.status_code == 200:
-                datasources = response.json()
-                assert len(datasources) > 0
-        except requests.exceptions.RequestException:
-            pytest.skip("Grafana not available")
+        response = http.get(
+            f"{grafana_url}/api/datasources",
+            auth=("admin", "admin"),
+            timeout=10
+        )
+        if response.status_code == 200:
+            datasources = response.json()
+            assert len(datasources) > 0
 
 
 @pytest.mark.integration
+@pytest.mark.needs_tempo
 class TestTempoIntegration:
     """Test Tempo tracing integration."""
 
@@ -89,31 +100,23 @@ class TestTempoIntegration:
     def tempo_url(self, test_config):
         return f"http://{test_config['tempo_host']}:{test_config['tempo_port']}"
 
-    def test_tempo_healthy(self, tempo_url):
+    def test_tempo_healthy(self, http, tempo_url):
         """Test Tempo is healthy."""
-        try:
-            response = requests.get(f"{tempo_url}/ready", timeout=10)
-            assert response.status_code == 200
-        except requests.exceptions.RequestException:
-            pytest.skip("Tempo not available")
+        response = http.get(f"{tempo_url}/ready", timeout=10)
+        assert response.status_code == 200
 
-    def test_traces_sent_after_request(self, tempo_url, wait_for_app, sample_prompt):
+    def test_traces_sent_after_request(self, http, tempo_url, wait_for_app, sample_prompt):
         """Test traces are sent after making a request."""
         # Make request to generate trace
-        requests.post(f"{wait_for_app}/predict", json=sample_prompt, timeout=30)
-
-        # Wait for trace to be processed
-        time.sleep(5)
+        http.post(f"{wait_for_app}/predict", json=sample_prompt, timeout=30)
 
         # Query Tempo for traces (basic check)
-        try:
-            response = requests.get(f"{tempo_url}/ready", timeout=10)
-            assert response.status_code == 200
-        except requests.exceptions.RequestException:
-            pytest.skip("Tempo not available")
+        response = http.get(f"{tempo_url}/ready", timeout=10)
+        assert response.status_code == 200
 
 
 @pytest.mark.integration
+@pytest.mark.needs_opensearch
 class TestOpenSearchIntegration:
     """Test OpenSearch log integration."""
 
@@ -121,23 +124,23 @@ class TestOpenSearchIntegration:
     def opensearch_url(self, test_config):
         return f"http://{test_config['opensearch_host']}:{test_config['opensearch_port']}"
 
-    def test_opensearch_healthy(self, opensearch_url):
+    def test_opensearch_healthy(self, http, opensearch_url):
         """Test OpenSearch is healthy."""
-        try:
-            response = requests.get(f"{opensearch_url}/_cluster/health", timeout=10)
-            assert response.status_code == 200
-        except requests.exceptions.RequestException:
-            pytest.skip("OpenSearch not available")
+        response = http.get(f"{opensearch_url}/_cluster/health", timeout=10)
+        assert response.status_code == 200
 
-    def test_opensearch_has_logs(self, opensearch_url, wait_for_app, sample_prompt):
+    def test_opensearch_has_logs(self, http, opensearch_url, wait_for_app, sample_prompt):
         """Test logs are shipped to OpenSearch."""
         # Generate some logs
-        requests.post(f"{wait_for_app}/predict", json=sample_prompt, timeout=30)
-        time.sleep(10)  # Wait for log shipping
-
-        try:
-            # Check if indices exist
-            response = requests.get(f"{opensearch_url}/_cat/indices", timeout=10)
-            assert response.status_code == 200
-        except requests.exceptions.RequestException:
-            pytest.skip("OpenSearch not available")
+        http.post(f"{wait_for_app}/predict", json=sample_prompt, timeout=30)
+
+        def indices_listed():
+            response = http.get(f"{opensearch_url}/_cat/indices", timeout=10)
+            # Keep polling only while OpenSearch answers with no index yet
+            return response if response.status_code != 200 or response.text.strip() else None
+
+        # Check if indices exist, polling until log shipping has created one
+        response = poll(indices_listed)
+        if response is None:
+            response = http.get(f"{opensearch_url}/_cat/indices", timeout=10)
+        assert response.status_code == 200
@@ -0,0 +1,47 @@
+"""
+Unit tests for the audit trail flusher.
+"""
+
+import pytest
+import time
+
+from prometheus_client import REGISTRY
+
+from main import AuditTrail
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    """Poll predicate until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestAuditFlusher:
+    """Test suite for the background audit flusher."""
+
+    def test_flusher_survives_emit_failure(self, monkeypatch):
+        """Test that a failed batch write is counted as dropped and later events are still written."""
+        calls = []
+        written = []
+
+        def flaky_emit(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise RuntimeError("disk full")
+            written.extend(batch)
+
+        monkeypatch.setattr(AuditTrail, "_emit", staticmethod(flaky_emit))
+        dropped_before = REGISTRY.get_sample_value("ai_audit_events_dropped_total")
+
+        AuditTrail.log_event("test_lost", "req-lost", {})
+        assert wait_until(lambda: len(calls) >= 1)
+
+        AuditTrail.log_event("test_written", "req-written", {})
+        assert wait_until(lambda: any(r["event_type"] == "test_written" for r in written))
+
+        assert AuditTrail._flusher.is_alive()
+        assert REGISTRY.get_sample_value("ai_audit_events_dropped_total") == dropped_before + 1
@@ -3,12 +3,8 @@ Unit tests for Semantic Drift Detection.
 """
 
 import pytest
-import sys
-import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app'))
-
-from main import SemanticDriftDetector
+from main import Config, SemanticDriftDetector, PromptContext, tokenize, WORD_RE
 
 
 class TestSemanticDriftDetector:
@@ -77,6 +73,13 @@ class TestSemanticDriftDetector:
         result = SemanticDriftDetector.analyze("", "A")
         assert isinstance(result, dict)
 
+    def test_prompt_context_matches_raw_prompt(self):
+        """Test a prebuilt PromptContext gives the same result as the raw prompt."""
+        prompt = "My doctor says the database system needs monitoring"
+        ctx = PromptContext.build(prompt)
+
+        assert SemanticDriftDetector.analyze(ctx, "A") == SemanticDriftDetector.analyze(prompt, "A")
+
     def test_different_scenarios(self):
         """Test analysis across different scenarios."""
         prompt = "Analyze this data"
@@ -133,3 +136,13 @@ class TestDriftEdgeCases:
         prompt = "How does the software system help with medical diagnosis?"
         result = SemanticDriftDetector.analyze(prompt, "A")
         assert isinstance(result, dict)
+
+    @pytest.mark.parametrize("unit", ["if ", "when ", "and ", "also "])
+    def test_adversarial_repetition_is_linear(self, unit, assert_linear_scan):
+        """Test that repeated complexity keywords with no follow-up scan in linear time."""
+        assert_linear_scan(lambda prompt: SemanticDriftDetector.analyze(prompt, "A"), unit, Config.MAX_PROMPT_CHARS)
+
+    def test_tokenize_matches_word_regex(self):
+        """Test the ASCII fast path yields the same tokens as the regex."""
+        for text in ["what's up, doc?", "snake_case & kebab-case", "tabs\tand\nnewlines", "Comment ça va"]:
+            assert tokenize(text) == frozenset(WORD_RE.findall(text))
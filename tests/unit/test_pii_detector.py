@@ -2,13 +2,27 @@
 Unit tests for PII Detection functionality.
 """
 
+import re
+
 import pytest
-import sys
-import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app'))
+from main import Config, PIIDetector, PIIType
+
 
-from main import PIIDetector, PIIType
+# Prompts covering every PII type, including matches that overlap across types
+EQUIVALENCE_CORPUS = [
+    "Contact me at john.doe@example.com for more info",
+    "Mon numéro est 06 12 34 56 78, ou +33 6 12 34 56 78",
+    "Call 01.02.03.04.05",
+    "Card 4111-1111-1111-1111, IBAN FR7612345678901234567890189",
+    "Server 192.168.1.1 and backup 10.0.0.254",
+    "Born 15/03/1985, SSN 185037512345678",
+    "Write to a.b@1.2.3.4.com or FR7612345678901@mail.fr",
+    "Contact a@b.com and c@d.com, call 06.12.34.56.78",
+    "0612 3456 7890 1234 then 0033612345678",
+    "This is a normal text about machine learning",
+    "",
+]
 
 
 class TestPIIDetector:
@@ -22,6 +36,13 @@ class TestPIIDetector:
         assert PIIType.EMAIL in result
         assert "john.doe@example.com" in result[PIIType.EMAIL]
 
+    def test_detect_email_long_local_part(self):
+        """Test that a long local part without dots is detected in full."""
+        email = "a" * 80 + "@example.com"
+        result = PIIDetector.detect(f"contact {email}")
+
+        assert result[PIIType.EMAIL] == [email]
+
     def test_detect_phone_french(self):
         """Test French phone number detection."""
         text = "Mon numéro est 06 12 34 56 78"
@@ -50,6 +71,13 @@ class TestPIIDetector:
 
         assert PIIType.IBAN in result
 
+    def test_iban_full_match_returned(self):
+        """Test that the full IBAN is returned, not a sub-group."""
+        text = "Transfer to FR7630006000011234567890189"
+        result = PIIDetector.detect(text)
+
+        assert result[PIIType.IBAN] == ["FR7630006000011234567890189"]
+
     def test_detect_ip_address(self):
         """Test IP address detection."""
         text = "Server is at 192.168.1.100"
@@ -57,6 +85,13 @@ class TestPIIDetector:
 
         assert PIIType.IP_ADDRESS in result
 
+    def test_overlapping_pii_types_all_reported(self):
+        """Test that an IP address inside a dotted phone number is reported too."""
+        result = PIIDetector.detect("Call 01.02.03.04.05")
+
+        assert result[PIIType.PHONE] == ["01.02.03.04.05"]
+        assert result[PIIType.IP_ADDRESS] == ["01.02.03.04"]
+
     def test_detect_date_of_birth(self):
         """Test date of birth detection."""
         text = "Born on 15/03/1990"
@@ -78,6 +113,13 @@ class TestPIIDetector:
 
         assert PIIType.NAME in result
 
+    def test_name_keyword_follows_list_order(self):
+        """Test that the first name keyword in list order is reported, not the earliest in the text."""
+        text = "I am here, my name is John Smith"
+        result = PIIDetector.detect(text)
+
+        assert result[PIIType.NAME] == ["my name is"]
+
     def test_detect_multiple_pii(self):
         """Test detection of multiple PII types."""
         text = "Contact john@test.com or call 06.12.34.56.78"
@@ -139,8 +181,47 @@ class TestPIIEdgeCases:
         result = PIIDetector.detect(text)
         assert isinstance(result, dict)
 
+    @pytest.mark.parametrize("unit", ["a.", "a-", "1.", "1-", "a@"])
+    def test_adversarial_repetition_is_linear(self, unit, assert_linear_scan):
+        """Test that a run of PII-like characters up to the prompt cap scans in linear time."""
+        assert_linear_scan(PIIDetector.detect, unit, Config.MAX_PROMPT_CHARS)
+
     def test_case_insensitive_keywords(self):
         """Test case insensitivity for name keywords."""
         text = "MY NAME IS JOHN"
         result = PIIDetector.detect(text)
         assert PIIType.NAME in result
+
+    def test_cached_result_not_shared(self):
+        """Test that mutating a result does not leak into repeat detections."""
+        text = "Email me at test@example.com"
+        PIIDetector.detect(text)[PIIType.EMAIL].append("tampered")
+        assert PIIDetector.detect(text)[PIIType.EMAIL] == ["test@example.com"]
+
+
+class TestPerPatternEquivalence:
+    """Test detect() against the original path: one re.findall per pattern."""
+
+    @pytest.mark.parametrize("text", EQUIVALENCE_CORPUS)
+    def test_matches_per_pattern_findall(self, text):
+        """Test that detect() reports every per-pattern match, in PATTERNS order.
+
+        The IBAN full-match fix lives in PATTERNS itself (non-capturing
+        group), so findall returns whole matches on both sides.
+        """
+        expected = {}
+        for pii_type, pattern in PIIDetector.PATTERNS.items():
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            if matches:
+                expected[pii_type] = matches
+
+        result = PIIDetector.detect(text)
+        result.pop(PIIType.NAME, None)
+        assert list(result.items()) == list(expected.items())
+
+    def test_non_ascii_digits_not_reported(self):
+        """Test the one intended difference: PII formats are matched as ASCII only."""
+        text = "Server ١٩٢.١٦٨.١.١"
+
+        assert re.findall(PIIDetector.PATTERNS[PIIType.IP_ADDRESS], text, re.IGNORECASE)
+        assert PIIType.IP_ADDRESS not in PIIDetector.detect(text)
@@ -0,0 +1,33 @@
+"""
+Unit tests for scenario normalization.
+"""
+
+import pytest
+
+from main import normalize_scenario, SCENARIO_ALIASES, SCENARIO_TAGS
+
+
+class TestNormalizeScenario:
+    """Test suite for scenario normalization."""
+
+    def test_empty_defaults_to_baseline(self):
+        """Test missing scenario handling."""
+        assert normalize_scenario("") == ("baseline", "nominal")
+
+    def test_short_alias(self):
+        """Test single-letter scenario aliases."""
+        assert normalize_scenario("B") == ("drift", "drift")
+
+    def test_whitespace_and_case(self):
+        """Test that aliases are matched after trimming and lowercasing."""
+        assert normalize_scenario("  High-Risk ") == ("high-risk", "risky")
+
+    def test_unknown_scenario_is_other(self):
+        """Test that unknown scenarios collapse to a single label value."""
+        assert normalize_scenario("made-up-scenario-123") == ("other", "nominal")
+
+    @pytest.mark.parametrize("raw", list(SCENARIO_ALIASES) + ["", "unknown", "x" * 500])
+    def test_tag_is_bounded(self, raw):
+        """Test that every returned tag is a known metric label value."""
+        tag, _ = normalize_scenario(raw)
+        assert tag in SCENARIO_TAGS